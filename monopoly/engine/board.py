@@ -5,27 +5,60 @@
 # Kelvin Wu
 #################
 
-import copy
+import collections
+import types
 
 from . import dice
 from . import notification
 from . import me_parser
 from . import player
+from . import profiler
 from . import tile
 
 
+def freeze(data):
+    """Returns a read-only copy of the given data. Dictionaries become
+    mappingproxy objects and lists become tuples, recursively."""
+    if isinstance(data, dict):
+        return types.MappingProxyType({key: freeze(value) for key, value in data.items()})
+    elif isinstance(data, list):
+        return tuple(freeze(value) for value in data)
+
+    return data
+
+
 class Board(object):
-    """Handles state information for the board."""
-    def __init__(self, skin):
+    """Handles state information for the board. Uses the given dice, or a new
+    pair of fair dice if none are given. In queued mode, notifications pushed
+    while another is being handled wait in a queue instead of being handled
+    inside the same call."""
+    def __init__(self, skin, gameDice=None):
         dataObject = me_parser.MonopolyInitParser(self, skin)
         dataObject.parse()
         self._subscriber = None
-        self._size = 40
+        self._journal = None
+        self._profiler = None
+        self._queue = None
+        self._draining = False
+        self._size = len(dataObject.tiles)
         self._style = dataObject.style
-        self._currency = dataObject.currency
+        self._currency = freeze(dataObject.currency)
         self._tiles = dataObject.tiles
-        self._dice = dice.Dice()
-        self._players = []
+        self._tileTable = dataObject.table
+        # read-only tile packs by position, None for tiles that changed since
+        # they were last packed, and the shared tuple of all of them
+        self._tileViews = [None] * self._size
+        self._tilesView = None
+        self._dice = gameDice if gameDice else dice.Dice()
+        # players keyed by name, in turn order
+        self._players = {}
+        # tiles keyed by name; the first tile wins when names repeat
+        self._tilesByName = {}
+        # owned tiles keyed by owner name, then by position
+        self._ownedTiles = {}
+
+        for t in reversed(self._tiles):
+            self._tilesByName[t.name] = t
 
     @property
     def size(self):
@@ -37,16 +70,89 @@ class Board(object):
 
     @property
     def currency(self):
-        # return a deep copy so Board's data isn't tampered with
-        return copy.deepcopy(self._currency)
+        """Returns the currency data as a read-only mapping shared by every
+        caller."""
+        return self._currency
 
     @property
     def tiles(self):
-        return [tile.pack() for tile in self._tiles]
+        """Returns a tuple of read-only tile packs ordered by position. The
+        tuple is shared by every caller until a tile changes, and only the
+        tiles that changed are packed again."""
+        if self._tilesView is None:
+            views = self._tileViews
+            for t in self._tiles:
+                if views[t.pos] is None:
+                    views[t.pos] = types.MappingProxyType(t.pack())
+
+            self._tilesView = tuple(views)
+
+        return self._tilesView
+
+    @property
+    def tileTable(self):
+        return self._tileTable
+
+    @property
+    def players(self):
+        """Returns the players still in the game, in turn order."""
+        return list(self._players.values())
+
+    def fork(self, gameDice=None):
+        """Returns an independent copy of the board without a subscriber,
+        journal or profiler. The copy shares the skin data, tile definitions and
+        cached packs with this board and copies only the mutable state. It
+        rolls the given dice, or fair dice showing the current faces."""
+        clone = object.__new__(Board)
+        clone._subscriber = None
+        clone._journal = None
+        clone._profiler = None
+        clone._queue = None
+        clone._draining = False
+        clone._size = self._size
+        clone._style = self._style
+        clone._currency = self._currency
+        clone._tileViews = list(self._tileViews)
+        clone._tilesView = self._tilesView
+
+        clone._tileTable = table = self._tileTable.copy()
+        clone._tiles = tiles = [t.fork(clone, table) for t in self._tiles]
+        clone._tilesByName = {name: tiles[t.pos] for name, t in self._tilesByName.items()}
+
+        if gameDice is None:
+            gameDice = self._dice.fork()
+        else:
+            gameDice.a = self._dice.a
+            gameDice.b = self._dice.b
+        clone._dice = gameDice
+
+        clone._players = players = {name: pl.fork(clone, tiles)
+                                    for name, pl in self._players.items()}
+        for pl in players.values():
+            if pl.debt:
+                pl.debt = (players.get(pl.debt[0].name), pl.debt[1])
+
+        table.owners[:] = [players[owner.name] if owner else None for owner in table.owners]
+        clone._ownedTiles = {name: {pos: tiles[pos] for pos in owned}
+                             for name, owned in self._ownedTiles.items()}
+        return clone
 
     def getTile(self, pos):
         return self._tiles[pos]
 
+    def tileChanged(self, pos):
+        """Called by the tile at the given position when its packed state
+        changes."""
+        self._tileViews[pos] = None
+        self._tilesView = None
+
+    def getTileByName(self, name):
+        return self._tilesByName.get(name)
+
+    def ownedTiles(self, player):
+        """Returns the tiles owned by the given player, ordered by position."""
+        return sorted(self._ownedTiles.get(player, {}).values(), key=lambda t: t.pos)
+
     def diceA(self):
         """Gets the value of the first die."""
         return self._dice.a
@@ -55,6 +161,11 @@ class Board(object):
         """Gets the value of the second die."""
         return self._dice.b
 
+    def diceSet(self, a, b):
+        """Sets the values shown by the dice."""
+        self._dice.a = a
+        self._dice.b = b
+
     def diceRoll(self):
         self._dice.roll()
 
@@ -65,29 +176,82 @@ class Board(object):
         return self._dice.isDouble()
 
     def getPlayer(self, name):
-        for pl in self._players:
-            if pl.name == name:
-                return pl
+        return self._players.get(name)
 
     def register(self, observer):
         """Registers a subscriber with the board. Replaces existing subscriber."""
         self._subscriber = observer
 
+    def attachJournal(self, gameJournal):
+        """Records every command accepted by the board in the given journal."""
+        self._journal = gameJournal
+
+    def attachProfiler(self, gameProfiler):
+        """Records every notification handled by the board in the given
+        profiler. None detaches the profiler."""
+        self._profiler = gameProfiler
+
+    @property
+    def queued(self):
+        return self._queue is not None
+
+    def setQueued(self, queued):
+        """Turns queued mode on or off."""
+        self._queue = collections.deque() if queued else None
+
     def acceptNotification(self, notification):
         """Handles a notification object pushed by model components or the
         controller."""
-        notification.visitBD(self)
+        if self._journal is not None:
+            self._journal.accept(notification)
+
+        if self._queue is not None:
+            self._queue.append(notification)
+            if not self._draining:
+                self._drain()
+        elif self._profiler is not None:
+            self._profiler.dispatch(profiler.BOARD_ACCEPT, notification.id,
+                                    notification.visitBD, self)
+        else:
+            notification.visitBD(self)
+
+    def _drain(self):
+        # handle queued notifications in order, including any they push
+        self._draining = True
+        try:
+            while self._queue:
+                notification = self._queue.popleft()
+                if self._profiler is not None:
+                    self._profiler.dispatch(profiler.BOARD_ACCEPT, notification.id,
+                                            notification.visitBD, self)
+                else:
+                    notification.visitBD(self)
+        except Exception:
+            self._queue.clear()
+            raise
+        finally:
+            self._draining = False
 
     def relayNotification(self, notification):
         """Passes the given notification on to the subscriber."""
-        self._subscriber.acceptNotification(notification)
+        if self._profiler is not None:
+            self._profiler.dispatch(profiler.BOARD_RELAY, notification.id,
+                                    self._subscriber.acceptNotification, notification)
+        else:
+            self._subscriber.acceptNotification(notification)
 
     def playerAdd(self, name, piece, pos=0, cash=None):
-        """Adds a player to the game."""
+        """Adds a player to the game. Raises ValueError if a player with the
+        same name is already in the game."""
+        if name in self._players:
+            raise ValueError("Player already in game: " + name)
+
         if cash is None:
-            self._players.append(player.Player(name, piece, pos, self, self._currency['defaultAmount']))
+            self._players[name] = player.Player(name, piece, pos, self, self._currency['defaultAmount'])
         else:
-            self._players.append(player.Player(name, piece, pos, self, cash))
+            self._players[name] = player.Player(name, piece, pos, self, cash)
+
+        self._ownedTiles[name] = {}
 
     def playerMove(self, player, delta):
         """Moves a player delta spaces."""
@@ -96,26 +260,78 @@ class Board(object):
             player.move(delta)
 
     def playerPurchase(self, player):
-        """Purchases the tile that player is standing on."""
+        """Purchases the tile that player is standing on. Does nothing if the
+        tile cannot be owned or is already owned."""
         player = self.getPlayer(player)
         if player != None:
-            player.purchase(self._tiles[player.pos])
+            prop = self._tiles[player.pos]
+            if not isinstance(prop, tile.OwnableTile) or prop.isOwned:
+                return
+
+            player.purchase(prop)
+            if prop.owner is player:
+                self._ownedTiles[player.name][prop.pos] = prop
 
-    def playerMortgage(self, player, tile):
-        """Mortgages the tile for player."""
+    def playerMortgage(self, player, name):
+        """Mortgages the named tile for player. Replies with NOT_OWNED if the
+        tile cannot be owned."""
         player = self.getPlayer(player)
-        if player != None:
-            for prop in self._tiles:
-                if prop.name == tile:
-                    player.mortgage(prop)
-                    break
+        prop = self.getTileByName(name)
+        if player != None and prop != None:
+            if isinstance(prop, tile.OwnableTile):
+                player.mortgage(prop)
+            else:
+                self.acceptNotification(notification.PNNotOwned(player, prop))
 
     def playerBankrupt(self, player, other):
-        """Removes a player from the game."""
+        """Removes a player from the game. Hands over all assets to other, or
+        back to the bank if other is not a player."""
         player = self.getPlayer(player)
         other = self.getPlayer(other)
 
-        for tile in player.properties:
-            tile.owner = other
+        # owned tiles are indexed in order of acquisition
+        owned = self._ownedTiles.pop(player.name)
+        for prop in owned.values():
+            prop.owner = other
+            if other:
+                other.addProperty(prop)
+            else:
+                prop.unmortgage()
+
+        if other:
+            self._ownedTiles[other.name].update(owned)
+            other.cash += player.cash
+
+        player.clearProperties()
+        player.cash = 0
+        player.debt = None
+        del self._players[player.name]
+
+    def restore(self, players, mortgaged, levels):
+        """Replaces the players and tile state of the game. players is a list
+        of (name, piece, pos, cash, properties, debt) tuples in turn order,
+        where properties lists the positions of the tiles owned in order of
+        acquisition and debt is a (creditor name, amount) tuple or None.
+        mortgaged and levels hold one byte per tile."""
+        self._players = {}
+        self._ownedTiles = {}
+        self._tileTable.owners[:] = [None] * self._size
+        self._tileTable.mortgaged[:] = mortgaged
+        self._tileTable.levels[:] = levels
+
+        for name, piece, pos, cash, _, _ in players:
+            self.playerAdd(name, piece, pos, cash)
+
+        for name, _, _, _, properties, debt in players:
+            owner = self._players[name]
+            for pos in properties:
+                prop = self._tiles[pos]
+                self._tileTable.owners[pos] = owner
+                self._ownedTiles[name][pos] = prop
+                owner.addProperty(prop)
+
+            if debt:
+                owner.debt = (self._players.get(debt[0]), debt[1])
 
-        self._players.remove(player)
+        for t in self._tiles:
+            t._touch()
@@ -5,7 +5,12 @@
 # Kelvin Wu
 #################
 
+import types
+
+from . import delta
+from . import journal
 from . import notification
+from . import profiler
 
 
 class Command(object):
@@ -24,7 +29,10 @@ class Command(object):
 
 
 class Move(Command):
-    """Handles a request to move a player piece."""
+    """Handles a request to move a player piece. A player may keep rolling on
+    doubles, up to MAX_ROLLS rolls per turn."""
+    MAX_ROLLS = 3
+
     def __init__(self, controller):
         super().__init__(controller)
         self.rollCount = 0
@@ -40,7 +48,7 @@ class Move(Command):
         isDouble = self.controller.board.diceIsDouble()
 
         if isDouble:
-            if self.rollCount == 2:
+            if self.rollCount == self.MAX_ROLLS - 1:
                 self.rollAgain = False
 
             self.rollCount += 1
@@ -87,11 +95,44 @@ class Mortgage(Command):
         pass
 
 
+def coalesce(events):
+    """Merges consecutive RENT_PAID events between the same two players into a
+    single event carrying the latest player data and the total rent. Takes and
+    returns a list of (code, data) pairs."""
+    merged = []
+    for code, data in events:
+        if merged and code == notification.RENT_PAID and merged[-1][0] == code:
+            last = merged[-1][1]
+            if (last['playerRenter']['name'] == data['playerRenter']['name'] and
+                    last['playerLandlord']['name'] == data['playerLandlord']['name']):
+                merged[-1] = (code, dict(data, rent=last['rent'] + data['rent']))
+                continue
+
+        merged.append((code, data))
+
+    return merged
+
+
 class Controller(object):
-    def __init__(self, board, view, debug):
+    """Passes commands from the view to the board and notifications from the
+    board to the view. In delta mode, notifications only carry the fields that
+    changed and are delivered through the view's notifyDelta method. If a
+    journal is given, the game is recorded in it. If a profiler is given,
+    notifications passing through the board and controller are counted and
+    timed. In queued mode, the board queues notifications instead of handling
+    them recursively and the view receives the notifications of each command
+    as a single coalesced batch once the command is done."""
+    def __init__(self, board, view, debug, deltaMode=False, gameJournal=None,
+                 gameProfiler=None, queued=False):
         self._board = board
         self._view = view
         self._debug = debug
+        self._encoder = delta.DeltaEncoder() if deltaMode else None
+        self._journal = gameJournal
+        self._profiler = gameProfiler
+        self._mirror = None
+        self._batch = [] if queued else None
+        self._inCommand = False
         self._viewNotifications = {
             notification.OUT_OF_MOVES: self._view.notifyOutOfMoves,
             notification.DICE_ROLL: self._view.notifyDiceRoll,
@@ -107,10 +148,22 @@ class Controller(object):
         }
         self._commands = {
             'roll': Move(self),
-            'purchase': Purchase(self)
+            'purchase': Purchase(self),
+            'mortgage': Mortgage(self)
         }
 
         self._board.register(self)
+        self._board.attachProfiler(self._profiler)
+        self._board.setQueued(queued)
+
+        if self._journal is not None:
+            self._board.attachJournal(self._journal)
+            self._journal.record(journal.GAME_START, {
+                'size': self.querySize(),
+                'style': self.queryStyle(),
+                'currency': dict(self.queryCurrency()),
+                'tiles': [dict(t) for t in self.queryTiles()]
+            })
 
     @property
     def board(self):
@@ -120,14 +173,91 @@ class Controller(object):
     def view(self):
         return self._view
 
+    @property
+    def profiler(self):
+        return self._profiler
+
+    def attachMirror(self, mirror):
+        """Loads the current state of the game into a view's state mirror, such
+        as view.view.StateMirror, and keeps it up to date with the full data of
+        every notification before the view receives it. In queued mode the
+        mirror is updated as notifications are raised, ahead of the batch."""
+        mirror.load(self.queryPlayers(), self.queryTiles())
+        self._mirror = mirror
+
     def acceptNotification(self, notification):
         """Accepts notification from the Board."""
-        notification.visitCT(self)
+        if self._profiler is not None:
+            self._profiler.dispatch(profiler.CONTROLLER_ACCEPT, notification.id,
+                                    notification.visitCT, self)
+        else:
+            notification.visitCT(self)
 
     def notifyView(self, code, data):
         """Sends a notification package to the view. Takes in code that identifies
         what kind of notification is being sent."""
-        self._viewNotifications[code](data)
+        if self._journal is not None:
+            self._journal.record(code, data)
+        if self._mirror is not None:
+            self._mirror.apply(code, data)
+
+        if self._inCommand:
+            self._batch.append((code, data))
+        elif self._profiler is not None:
+            self._profiler.dispatch(profiler.CONTROLLER_VIEW, code, self._sendView, code, data)
+        else:
+            self._sendView(code, data)
+
+    def _sendView(self, code, data):
+        if self._encoder:
+            self._view.notifyDelta(code, self._encoder.encode(data))
+        else:
+            self._viewNotifications[code](data)
+
+    def _execute(self, command, *args):
+        # in queued mode, collect the notifications of the command and send
+        # them once it is done; commands issued by the view get their own batch
+        if self._batch is None or self._inCommand:
+            command(*args)
+            return
+
+        self._inCommand = True
+        try:
+            command(*args)
+        except Exception:
+            self._batch = []
+            raise
+        finally:
+            self._inCommand = False
+
+        self._flush()
+
+    def _flush(self):
+        events = coalesce(self._batch)
+        self._batch = []
+        if not events:
+            return
+
+        if self._encoder:
+            events = [(code, self._encoder.encode(data)) for code, data in events]
+            send = self._view.notifyDeltaBatch
+        else:
+            send = self._view.notifyBatch
+
+        if self._profiler is not None:
+            self._profiler.dispatch(profiler.CONTROLLER_VIEW, profiler.BATCH, send, events)
+        else:
+            send(events)
+
+    def fork(self, view, gameDice=None):
+        """Returns a controller for an independent copy of the game, attached to
+        the given view. See Board.fork. The copy keeps the roll state of the
+        current turn and the queued mode of this controller, but is not
+        journalled, profiled or delta encoded."""
+        clone = Controller(self._board.fork(gameDice), view, self._debug,
+                           queued=self._batch is not None)
+        clone.restoreRollState(*self.rollState())
+        return clone
 
     def querySize(self):
         """Returns the size of the game board."""
@@ -138,34 +268,79 @@ class Controller(object):
         return self._board.style
 
     def queryCurrency(self):
-        """Returns currency data for the current game."""
+        """Returns currency data for the current game as a read-only mapping.
+        The mapping is shared, so it costs nothing to query."""
         return self._board.currency
 
     def queryTiles(self):
-        """Returns a list of tile data for each tile in the board, structured
+        """Returns a tuple of tile data for each tile in the board, structured
         according to the pack() method of each tile. The tiles are ordered from
-        least to greatest index."""
+        least to greatest index. The tuple and its read-only mappings are
+        shared between calls and only rebuilt for tiles that changed."""
         return self._board.tiles
 
+    def queryPlayers(self):
+        """Returns a tuple of player data for each player still in the game,
+        structured according to the pack() method of each player. The players
+        are ordered by turn. Each player is a read-only view of its cached
+        pack, whose property list must not be modified."""
+        return tuple(types.MappingProxyType(pl.pack()) for pl in self._board.players)
+
     def playerAdd(self, name, piece):
         """Adds a player to the game."""
         self._board.playerAdd(name, piece)
+        if self._mirror is not None:
+            self._mirror.updatePlayer(self._board.getPlayer(name).pack())
+        if self._journal is not None:
+            self._journal.record(journal.PLAYER_ADD,
+                                 {'player': self._board.getPlayer(name).pack()})
 
     def playerMove(self, player):
         """Executes command: moves the player."""
-        self._commands['roll'].execute(player)
+        self._execute(self._commands['roll'].execute, player)
 
     def playerPurchase(self, player):
         """Executes command: purchases tile that player is located at."""
-        self._commands['purchase'].execute(player)
+        self._execute(self._commands['purchase'].execute, player)
 
     def playerMortgage(self, player, tile):
         """Executes command: mortgages tile given."""
-        self._commands['mortgage'].execute(player, tile)
+        self._execute(self._commands['mortgage'].execute, player, tile)
 
     def playerBankrupt(self, player, other):
         """Removes a player from the game."""
+        if self._journal is None and self._mirror is None:
+            self._board.playerBankrupt(player, other)
+            return
+
+        properties = self._board.ownedTiles(player)
         self._board.playerBankrupt(player, other)
+        heir = self._board.getPlayer(other)
+        tiles = [t.pack() for t in properties]
+
+        if self._mirror is not None:
+            self._mirror.removePlayer(player)
+            if heir:
+                self._mirror.updatePlayer(heir.pack())
+            for t in tiles:
+                self._mirror.updateTile(t)
+        if self._journal is not None:
+            self._journal.record(journal.PLAYER_BANKRUPT, {
+                'player': player,
+                'other': heir.pack() if heir else {'name': None},
+                'tiles': tiles
+            })
+
+    def rollState(self):
+        """Returns the (rollCount, rollAgain) state of the move command."""
+        move = self._commands['roll']
+        return move.rollCount, move.rollAgain
+
+    def restoreRollState(self, rollCount, rollAgain):
+        """Restores the state of the move command."""
+        move = self._commands['roll']
+        move.rollCount = rollCount
+        move.rollAgain = rollAgain
 
     def resetCommandState(self):
         """Resets state of all commands."""
@@ -175,12 +350,15 @@ class Controller(object):
     # DEBUG
     def playerMoveDebug(self, player, num):
         if self._debug:
-            data = {
-                'diceA': num / 2,
-                'diceB': num / 2,
-                'isDouble': False,
-                'rollAgain': False
-            }
-
-            self.notifyView(notification.DICE_ROLL, data)
-            self._board.acceptNotification(notification.CNPlayerMove(player, num))
+            self._execute(self._moveDebug, player, num)
+
+    def _moveDebug(self, player, num):
+        data = {
+            'diceA': num / 2,
+            'diceB': num / 2,
+            'isDouble': False,
+            'rollAgain': False
+        }
+
+        self.notifyView(notification.DICE_ROLL, data)
+        self._board.acceptNotification(notification.CNPlayerMove(player, num))
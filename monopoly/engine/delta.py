@@ -0,0 +1,51 @@
+#################
+# Monopoly/Engine
+# delta.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+# notification data keys holding player and tile packs
+PLAYER_KEYS = frozenset(['player', 'playerRenter', 'playerLandlord', 'other'])
+TILE_KEYS = frozenset(['tile'])
+
+
+class DeltaEncoder(object):
+    """Encodes notification data as deltas. Each player or tile pack is
+    replaced by its name and the fields that changed since it was last sent.
+    Every encoded notification carries a state version that increases by one
+    per notification, so receivers can detect a missed delta."""
+    def __init__(self):
+        self._version = 0
+        self._sent = {}
+
+    @property
+    def version(self):
+        return self._version
+
+    def encode(self, data):
+        """Returns the delta encoding of the given notification data."""
+        self._version += 1
+        encoded = {'version': self._version}
+        for key, value in data.items():
+            if key in PLAYER_KEYS:
+                encoded[key] = self._diff('player', value)
+            elif key in TILE_KEYS:
+                encoded[key] = self._diff('tile', value)
+            else:
+                encoded[key] = value
+
+        return encoded
+
+    def _diff(self, kind, pack):
+        if pack['name'] is None:
+            return pack
+
+        sent = self._sent.setdefault((kind, pack['name']), {})
+        delta = {'name': pack['name']}
+        for field, value in pack.items():
+            if field not in sent or sent[field] != value:
+                delta[field] = value
+                sent[field] = value
+
+        return delta
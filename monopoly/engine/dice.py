@@ -5,19 +5,33 @@
 # Kelvin Wu
 #################
 
+import array
 import random
 
 
 class Dice(object):
-    """An object representing two fair dice."""
-    def __init__(self):
+    """An object representing two fair dice. Rolls are drawn from the given
+    random.Random instance, or from the global random module if none is given."""
+    FACES = 6
+    __slots__ = ('a', 'b', '_rng')
+
+    def __init__(self, rng=None):
         self.a = 6
         self.b = 6
+        self._rng = rng if rng else random
+
+    def fork(self, rng=None):
+        """Returns fair dice showing the same faces that roll from the given
+        random.Random instance, so rolling them never disturbs these dice."""
+        clone = Dice(rng)
+        clone.a = self.a
+        clone.b = self.b
+        return clone
 
     def roll(self):
         """Re-rolls the dice."""
-        self.a = random.randrange(6) + 1
-        self.b = random.randrange(6) + 1
+        self.a = self._rng.randrange(self.FACES) + 1
+        self.b = self._rng.randrange(self.FACES) + 1
 
     def sum(self):
         """Returns sum of the two dice."""
@@ -26,3 +40,60 @@ class Dice(object):
     def isDouble(self):
         """Returns true if both dice show the face."""
         return self.a == self.b
+
+    @classmethod
+    def outcomes(cls):
+        """Returns a list of (a, b, probability) tuples covering every possible
+        roll of the dice."""
+        p = 1 / (cls.FACES * cls.FACES)
+        return [(a, b, p) for a in range(1, cls.FACES + 1) for b in range(1, cls.FACES + 1)]
+
+
+class TapeDice(Dice):
+    """Dice that hand out rolls from a tape of faces. Faces are generated in
+    blocks, and every face handed out stays on the tape so the exact rolls of a
+    game can be saved and replayed. Dice given a tape replay it and raise
+    EOFError once it runs out."""
+    MAGIC = b'MDT1'
+    __slots__ = ('_tape', '_next', '_replay', '_blockSize', '_faces')
+
+    def __init__(self, rng=None, tape=None, blockSize=4096):
+        super().__init__(rng)
+        self._tape = array.array('B', tape if tape else b'')
+        self._next = 0
+        self._replay = tape is not None
+        self._blockSize = blockSize
+        self._faces = range(1, self.FACES + 1)
+
+    @property
+    def tape(self):
+        """Returns the faces handed out so far, two per roll."""
+        return self._tape[:self._next].tobytes()
+
+    def roll(self):
+        if self._next + 2 > len(self._tape):
+            if self._replay:
+                raise EOFError("Dice tape exhausted after {} rolls".format(self._next // 2))
+
+            self._tape.extend(self._rng.choices(self._faces, k=self._blockSize))
+
+        self.a = self._tape[self._next]
+        self.b = self._tape[self._next + 1]
+        self._next += 2
+
+    def save(self, path):
+        """Writes the faces handed out so far to the given file."""
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(self.tape)
+
+    @classmethod
+    def load(cls, path):
+        """Returns dice that replay the tape stored in the given file."""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if data[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("Not a dice tape: " + path)
+
+        return cls(tape=data[len(cls.MAGIC):])
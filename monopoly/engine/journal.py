@@ -0,0 +1,175 @@
+#################
+# Monopoly/Engine
+# journal.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+import marshal
+import struct
+
+from . import delta
+from . import notification
+
+# record codes that are not notifications
+GAME_START = 'GAME_START'
+PLAYER_ADD = 'PLAYER_ADD'
+PLAYER_BANKRUPT = 'PLAYER_BANKRUPT'
+
+# every code that may appear in a journal, stored as its index
+CODES = (GAME_START, PLAYER_ADD, PLAYER_BANKRUPT,
+         notification.MOVE_CMD, notification.PURCHASE_CMD, notification.MORTGAGE_CMD,
+         notification.OUT_OF_MOVES, notification.DICE_ROLL, notification.BUY_OPP,
+         notification.PASS_GO, notification.TILE_PURCHASE, notification.INSUFFICIENT_FUNDS,
+         notification.LIQUIDATE, notification.PLAYER_MOVE, notification.RENT_PAID,
+         notification.MORTGAGE, notification.NOT_OWNED)
+COMMANDS = frozenset([notification.MOVE_CMD, notification.PURCHASE_CMD,
+                      notification.MORTGAGE_CMD])
+
+MAGIC = b'MJN1'
+# magic, marshal format version
+_HEADER = struct.Struct('<4sB')
+# code index, payload length
+_RECORD = struct.Struct('<BI')
+_INDEX = {code: i for i, code in enumerate(CODES)}
+
+
+class Journal(object):
+    """Append-only record of a game. Stores every command the controller sends
+    to the board and every notification sent to the view, each as a code and a
+    marshalled data package."""
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, marshal.version))
+
+    def record(self, code, data):
+        """Appends a record to the journal."""
+        payload = marshal.dumps(data)
+        self._file.write(_RECORD.pack(_INDEX[code], len(payload)))
+        self._file.write(payload)
+
+    def accept(self, notification):
+        """Appends a notification accepted by the board to the journal if it is a
+        command. Other notifications are recorded when they reach the view."""
+        if notification.id in COMMANDS:
+            self.record(notification.id, notification.pack())
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayController(object):
+    """Stands in for the controller of a replayed game. Answers queries with the
+    data recorded when the game started and ignores every command."""
+    def __init__(self, start):
+        self._start = start
+
+    def querySize(self):
+        return self._start['size']
+
+    def queryStyle(self):
+        return self._start['style']
+
+    def queryCurrency(self):
+        return dict(self._start['currency'])
+
+    def queryTiles(self):
+        return [dict(t) for t in self._start['tiles']]
+
+    def queryPlayers(self):
+        return []
+
+    def attachMirror(self, mirror):
+        # the replayer feeds the mirror as it drives the view
+        mirror.load([], self.queryTiles())
+
+    def __getattr__(self, name):
+        # commands such as playerMove or playerPurchase do nothing
+        return lambda *args: None
+
+
+class Replayer(object):
+    """Reads a journal and replays it without running any game logic."""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._data = f.read()
+
+        if len(self._data) < _HEADER.size:
+            raise ValueError("Not a game journal: " + path)
+
+        magic, version = _HEADER.unpack_from(self._data)
+        if magic != MAGIC:
+            raise ValueError("Not a game journal: " + path)
+        elif version != marshal.version:
+            raise ValueError("Journal was written with marshal version {}".format(version))
+
+    def records(self):
+        """Yields every (code, data) record in the journal, in order. A partly
+        written final record is ignored."""
+        data = self._data
+        offset = _HEADER.size
+        end = len(data)
+        while offset + _RECORD.size <= end:
+            index, length = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > end:
+                break
+
+            yield CODES[index], marshal.loads(data[offset:offset + length])
+            offset += length
+
+    def drive(self, view):
+        """Sends every recorded view notification to the given view. The view is
+        registered with a ReplayController, so its commands have no effect. If
+        the view keeps a state mirror, it is updated from every record."""
+        mirror = None
+        for code, data in self.records():
+            if code == GAME_START:
+                view.registerController(ReplayController(data))
+                mirror = view.mirror
+            elif code == PLAYER_ADD:
+                if mirror is not None:
+                    mirror.updatePlayer(data['player'])
+            elif code == PLAYER_BANKRUPT:
+                if mirror is not None:
+                    mirror.removePlayer(data['player'])
+                    if data['other']['name'] is not None:
+                        mirror.updatePlayer(data['other'])
+                    for t in data['tiles']:
+                        mirror.updateTile(t)
+            elif code in view.NOTIFY_METHODS:
+                if mirror is not None:
+                    mirror.apply(code, data)
+                getattr(view, view.NOTIFY_METHODS[code])(data)
+
+    def rebuild(self):
+        """Returns the final state of the last game in the journal as (players,
+        tiles): a dictionary of the latest player packs keyed by name, ordered
+        by turn and excluding players that went bankrupt, and a list of the
+        latest tile packs ordered by position."""
+        players = {}
+        tiles = []
+        for code, data in self.records():
+            if code == GAME_START:
+                players = {}
+                tiles = list(data['tiles'])
+            elif code == PLAYER_ADD:
+                players[data['player']['name']] = data['player']
+            elif code == PLAYER_BANKRUPT:
+                players.pop(data['player'], None)
+                for t in data['tiles']:
+                    tiles[t['pos']] = t
+                if data['other']['name'] is not None:
+                    players[data['other']['name']] = data['other']
+            elif code not in COMMANDS:
+                for key, value in data.items():
+                    if key in delta.PLAYER_KEYS and value['name'] in players:
+                        players[value['name']] = dict(players[value['name']], **value)
+                    elif key in delta.TILE_KEYS:
+                        tiles[value['pos']] = value
+
+        return players, tiles
@@ -6,17 +6,150 @@
 #################
 
 import abc
+import hashlib
 import json
+import marshal
+import os
+import struct
+import tempfile
 
 from . import tile
 
+# directory, next to the skin files, holding compiled skins
+CACHE_DIR = '__skincache__'
+# bumped whenever the layout of a compiled skin changes
+COMPILED_FORMAT = 2
+TILE_TYPES = ('basic', 'property')
+
+CACHE_MAGIC = b'MSK1'
+# magic, marshal format version, compiled format
+_CACHE_HEADER = struct.Struct('<4sBB')
+
+# compiled skins loaded by this process, keyed on (path, mtime, size)
+_compiled = {}
+
+
+def compileSkin(data):
+    """Validates the decoded JSON of a skin and returns it in compiled form: a
+    (style, currency, tiles) tuple where each tile is a (name, index, type,
+    data) tuple and rent tables are tuples. Raises ValueError if the skin is
+    malformed."""
+    try:
+        style = data['style']
+        currency = data['currency']
+        currency = {
+            'name': str(currency['name']),
+            'symbol': str(currency['symbol']),
+            'defaultAmount': int(currency['defaultAmount'])
+        }
+
+        tiles = []
+        for pos, t in enumerate(data['tiles']):
+            if t['index'] != pos:
+                raise ValueError("Tile {} is out of order".format(t['index']))
+            elif t['type'] not in TILE_TYPES:
+                raise ValueError("Unknown tile type: {}".format(t['type']))
+
+            tileData = t['data']
+            if t['type'] == 'property':
+                tileData = {'cost': int(tileData['cost']),
+                            'rent': tuple(int(r) for r in tileData['rent'])}
+                if not tileData['rent']:
+                    raise ValueError("Property {} has no rent".format(t['name']))
+
+            tiles.append((str(t['name']), pos, t['type'], tileData))
+    except (KeyError, TypeError) as e:
+        raise ValueError("Malformed skin: {!r}".format(e))
+
+    if not tiles:
+        raise ValueError("Skin has no tiles")
+
+    return (str(style), currency, tuple(tiles))
+
+
+def loadSkin(skin):
+    """Returns (style, currency, tileDefs) for the given skin file. Skins are
+    compiled once and stored in CACHE_DIR, keyed on the hash of the JSON, so
+    later loads skip parsing and validation. Loads within a process are
+    memoized until the file is modified, so every board using the skin shares
+    the same TileDef objects."""
+    path = os.path.abspath(skin)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key in _compiled:
+        return _compiled[key]
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    digest = hashlib.sha1(raw).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    cachePath = os.path.join(os.path.dirname(path), CACHE_DIR,
+                             '{}-{}.bin'.format(name, digest))
+
+    loaded = _readCache(cachePath)
+    if loaded is None:
+        compiled = compileSkin(json.loads(raw.decode('utf-8')))
+        _writeCache(cachePath, compiled)
+        style, currency, tiles = compiled
+        loaded = (style, currency, _tileDefs(tiles))
+
+    _compiled[key] = loaded
+    return loaded
+
+
+def _tileDefs(tiles):
+    return tuple(tile.TileDef(name, pos, tileType,
+                              data['cost'] if tileType == 'property' else None,
+                              data['rent'] if tileType == 'property' else ())
+                 for name, pos, tileType, data in tiles)
+
+
+def _readCache(cachePath):
+    """Returns (style, currency, tileDefs) from a compiled skin, or None if it
+    is missing, stale or cannot be read for any reason."""
+    try:
+        with open(cachePath, 'rb') as f:
+            data = f.read()
+
+        if _CACHE_HEADER.unpack_from(data) != (CACHE_MAGIC, marshal.version, COMPILED_FORMAT):
+            return None
+
+        style, currency, tiles = marshal.loads(data[_CACHE_HEADER.size:])
+        return (str(style), dict(currency), _tileDefs(tiles))
+    except Exception:
+        # a cache that cannot be used is recompiled
+        return None
+
+
+def _writeCache(cachePath, compiled):
+    """Stores a compiled skin. The file is written under a temporary name and
+    renamed into place, so other processes never read a partial file."""
+    directory = os.path.dirname(cachePath)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tempPath = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    except OSError:
+        # the cache is only an optimization
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_CACHE_HEADER.pack(CACHE_MAGIC, marshal.version, COMPILED_FORMAT))
+            f.write(marshal.dumps(compiled))
+        os.replace(tempPath, cachePath)
+    except OSError:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+
 
 class MonopolyDataParser(abc.ABC):
-    """Abstract class for JSON data parsers."""
+    """Abstract class for skin data parsers."""
     def __init__(self, board, skin):
         self._board = board
-        with open(skin) as data:
-            self._file = json.load(data)
+        self._file = loadSkin(skin)
 
     @abc.abstractmethod
     def parse(self):
@@ -26,16 +159,17 @@ class MonopolyDataParser(abc.ABC):
 
 
 class MonopolyInitParser(MonopolyDataParser):
-    """Parses JSON file that contains tile initialization data."""
+    """Builds the tiles of a board from a compiled skin. The tiles share their
+    definitions with every other board using the skin and keep their state in
+    a new TileTable."""
     def __init__(self, board, skin):
         super().__init__(board, skin)
         self.tiles = []
 
     def parse(self):
-        self.style = self._file['style']
-        self.currency = self._file['currency']
+        self.style, currency, tileDefs = self._file
+        self.currency = dict(currency)
+        self.table = tile.TileTable(len(tileDefs))
 
-        for i in self._file['tiles']:
-            self.tiles.append(tile.TileFactory.makeTile(self._board, i['name'],
-                                                        i['index'], i['type'], 
-                                                        i['data']))
+        for tileDef in tileDefs:
+            self.tiles.append(tile.TileFactory.makeTile(self._board, self.table, tileDef))
@@ -20,9 +20,16 @@ RENT_PAID = 'RENT_PAID'
 MORTGAGE = 'MORTGAGE'
 NOT_OWNED = 'NOT_OWNED'
 
+# command codes
+MOVE_CMD = 'MOVE_CMD'
+PURCHASE_CMD = 'PURCHASE_CMD'
+MORTGAGE_CMD = 'MORTGAGE_CMD'
+
 
 class Notification(abc.ABC):
     """Abstract notification class."""
+    __slots__ = ()
+
     @abc.abstractmethod
     def visitBD(self, other):
         """Visit method for board."""
@@ -36,6 +43,8 @@ class Notification(abc.ABC):
 
 class ModelViewNotification(Notification):
     """A notification that is relayed from the model to the view."""
+    __slots__ = ('id', 'data')
+
     def visitBD(self, other):
         other.relayNotification(self)
 
@@ -45,12 +54,21 @@ class ModelViewNotification(Notification):
 
 class ControllerModelNotification(Notification):
     """A notification sent from the controller to the model."""
+    __slots__ = ()
+
     def visitCT(self, other):
         pass
 
+    @abc.abstractmethod
+    def pack(self):
+        """Returns a dictionary containing the arguments of the command."""
+        pass
+
 
 class TNBuyOpp(ModelViewNotification):
     """Notification that a player has landed on a purchasable tile."""
+    __slots__ = ()
+
     def __init__(self, player, tile):
         self.id = BUY_OPP
         self.data = {
@@ -61,6 +79,8 @@ class TNBuyOpp(ModelViewNotification):
 
 class PNPlayerMove(ModelViewNotification):
     """Notification that a player has moved to a new location."""
+    __slots__ = ('_player',)
+
     def __init__(self, player):
         self._player = player
         self.id = PLAYER_MOVE
@@ -77,6 +97,8 @@ class PNPlayerMove(ModelViewNotification):
 
 class PNPassGo(ModelViewNotification):
     """Notification that a player has passed GO."""
+    __slots__ = ()
+
     def __init__(self, player):
         self.id = PASS_GO
         self.data = {
@@ -86,6 +108,8 @@ class PNPassGo(ModelViewNotification):
 
 class PNTilePurchase(ModelViewNotification):
     """Notification that a player has purchased a tile."""
+    __slots__ = ()
+
     def __init__(self, player, tile):
         self.id = TILE_PURCHASE
         self.data = {
@@ -97,6 +121,8 @@ class PNTilePurchase(ModelViewNotification):
 class PNInsufficientFunds(ModelViewNotification):
     """Notification that a player has insufficient funds to complete the
     current action."""
+    __slots__ = ()
+
     def __init__(self, player, deficit):
         self.id = INSUFFICIENT_FUNDS
         self.data = {
@@ -107,6 +133,8 @@ class PNInsufficientFunds(ModelViewNotification):
 
 class PNLiquidate(ModelViewNotification):
     """Notification that a player must begin liquidating their assets."""
+    __slots__ = ()
+
     def __init__(self, player, other, required):
         self.id = LIQUIDATE
         self.data = {
@@ -118,6 +146,8 @@ class PNLiquidate(ModelViewNotification):
 
 class PNRentPaid(ModelViewNotification):
     """Notification that a player has paid rent."""
+    __slots__ = ()
+
     def __init__(self, playerRenter, playerLandlord, rent):
         self.id = RENT_PAID
         self.data = {
@@ -129,6 +159,8 @@ class PNRentPaid(ModelViewNotification):
 
 class PNMortgage(ModelViewNotification):
     """Notification that a player has mortgaged a property."""
+    __slots__ = ()
+
     def __init__(self, player, tile):
         self.id = MORTGAGE
         self.data = {
@@ -140,6 +172,8 @@ class PNMortgage(ModelViewNotification):
 class PNNotOwned(ModelViewNotification):
     """Notification that a player is attempting to perform an action on a tile
     they do not own."""
+    __slots__ = ()
+
     def __init__(self, player, tile):
         self.id = NOT_OWNED
         self.data = {
@@ -150,28 +184,46 @@ class PNNotOwned(ModelViewNotification):
 
 class CNPlayerMove(ControllerModelNotification):
     """Notification that a player is attempting a move."""
+    __slots__ = ('player', 'delta')
+    id = MOVE_CMD
+
     def __init__(self, player, delta):
         self.player = player
         self.delta = delta
 
+    def pack(self):
+        return {'player': self.player, 'delta': self.delta}
+
     def visitBD(self, other):
         other.playerMove(self.player, self.delta)
 
 
 class CNPlayerPurchase(ControllerModelNotification):
     """Notification that a player is attempting to purchase a property."""
+    __slots__ = ('player',)
+    id = PURCHASE_CMD
+
     def __init__(self, player):
         self.player = player
 
+    def pack(self):
+        return {'player': self.player}
+
     def visitBD(self, other):
         other.playerPurchase(self.player)
 
 
 class CNPlayerMortgage(ControllerModelNotification):
     """Notification that a player is attempting to mortgage a property."""
+    __slots__ = ('player', 'tile')
+    id = MORTGAGE_CMD
+
     def __init__(self, player, tile):
         self.player = player
         self.tile = tile
 
+    def pack(self):
+        return {'player': self.player, 'tile': self.tile}
+
     def visitBD(self, other):
         other.playerMortgage(self.player, self.tile)
@@ -10,6 +10,9 @@ from . import notification
 
 class Player(object):
     """Class to store player state data."""
+    __slots__ = ('_name', '_piece', '_pos', '_board', '_cash', '_properties', '_debt',
+                 '_version', '_packed')
+
     def __init__(self, name, piece, pos, board, cash):
         self._name = name
         self._piece = piece
@@ -17,6 +20,9 @@ class Player(object):
         self._board = board
         self._cash = cash
         self._properties = []
+        self._debt = None
+        self._version = 0
+        self._packed = None
 
     @property
     def name(self):
@@ -37,25 +43,70 @@ class Player(object):
     @cash.setter
     def cash(self, val):
         self._cash = val
+        self._touch()
 
     @property
     def properties(self):
         return self._properties
 
-    def pack(self):
-        """Returns a dictionary containing the state information of the player."""
-        data = {
-            'name': self._name,
-            'piece': self._piece,
-            'pos': self._pos,
-            'cash': self._cash,
-            'properties': []
-        }
+    @property
+    def debt(self):
+        return self._debt
+
+    @debt.setter
+    def debt(self, val):
+        self._debt = val
 
-        for i in self._properties:
-            data['properties'].append({'name': i.name, 'value': i.value})
+    @property
+    def version(self):
+        """Counter that is incremented whenever the packed state changes."""
+        return self._version
+
+    def _touch(self):
+        self._version += 1
+        self._packed = None
+
+    def fork(self, board, tiles):
+        """Returns a copy of the player for a forked board whose tiles, indexed
+        by position, are given. The copy shares the cached pack. Its debt is
+        still owed to a player of this board until the forked board replaces
+        it."""
+        clone = object.__new__(Player)
+        clone._name = self._name
+        clone._piece = self._piece
+        clone._pos = self._pos
+        clone._board = board
+        clone._cash = self._cash
+        clone._properties = [tiles[t.pos] for t in self._properties]
+        clone._debt = self._debt
+        clone._version = self._version
+        clone._packed = self._packed
+        return clone
+
+    def addProperty(self, tile):
+        """Adds the tile to the player's properties."""
+        self._properties.append(tile)
+        self._touch()
+
+    def clearProperties(self):
+        """Removes all of the player's properties."""
+        self._properties.clear()
+        self._touch()
 
-        return data
+    def pack(self):
+        """Returns a dictionary containing the state information of the player.
+        The dictionary is cached until the state changes, so it must not be
+        modified."""
+        if self._packed is None:
+            self._packed = {
+                'name': self._name,
+                'piece': self._piece,
+                'pos': self._pos,
+                'cash': self._cash,
+                'properties': [t.summary for t in self._properties]
+            }
+
+        return self._packed
 
     def move(self, delta):
         """Moves player delta tiles from current position."""
@@ -63,20 +114,25 @@ class Player(object):
         # check for Pass GO condition
         if delta > 0 and newPos < self._pos:
             self._cash += 200
+            self._touch()
             self._board.acceptNotification(notification.PNPassGo(self))
 
         self._pos = newPos
+        self._touch()
         self._board.acceptNotification(notification.PNPlayerMove(self))
 
     def payRent(self, player, amount):
         """Pays the required rent to the other player. Sends a notification
-        when the debt is too high."""
+        when the debt is too high. The debt is settled once enough assets have
+        been liquidated."""
         if player.name == self._name:
             return
         elif self._cash - amount < 0:
+            self._debt = (player, amount)
             self._board.acceptNotification(notification.PNLiquidate(self, player, amount))
         else:
             self._cash -= amount
+            self._touch()
             player.cash += amount
             self._board.acceptNotification(notification.PNRentPaid(self, player, amount))
 
@@ -85,6 +141,7 @@ class Player(object):
         if tile.value <= self._cash:
             self._cash -= tile.value
             tile.owner = self
+            self.addProperty(tile)
             self._board.acceptNotification(notification.PNTilePurchase(self, tile))
         else:
             self._board.acceptNotification(notification.PNInsufficientFunds(self, tile.value - self._cash))
@@ -92,7 +149,20 @@ class Player(object):
     def mortgage(self, tile):
         """Mortgages the tile."""
         if tile.owner and tile.owner.name == self._name:
+            if tile.mortgaged:
+                return
+
             tile.mortgage()
+            self._cash += tile.value // 2
+            self._touch()
             self._board.acceptNotification(notification.PNMortgage(self, tile))
+            self.settleDebt()
         else:
             self._board.acceptNotification(notification.PNNotOwned(self, tile))
+
+    def settleDebt(self):
+        """Pays off an outstanding rent debt if the player can now afford it."""
+        if self._debt and self._debt[1] <= self._cash:
+            player, amount = self._debt
+            self._debt = None
+            self.payRent(player, amount)
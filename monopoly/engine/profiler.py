@@ -0,0 +1,124 @@
+#################
+# Monopoly/Engine
+# profiler.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+import time
+
+# instrumented dispatch sites
+BOARD_ACCEPT = 'Board.acceptNotification'
+BOARD_RELAY = 'Board.relayNotification'
+CONTROLLER_ACCEPT = 'Controller.acceptNotification'
+CONTROLLER_VIEW = 'Controller.notifyView'
+
+# key of the batches a queued controller sends to the view
+BATCH = 'BATCH'
+
+# latency histogram buckets are powers of two nanoseconds
+_BUCKETS = 48
+
+
+class _Counter(object):
+    """Dispatch statistics for a single notification type at a single site."""
+    __slots__ = ('count', 'total', 'max', 'maxDepth', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.maxDepth = 0
+        self.buckets = [0] * _BUCKETS
+
+    def percentile(self, q):
+        """Returns the upper bound, in nanoseconds, of the histogram bucket that
+        holds the given fraction of dispatches."""
+        target = q * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target and n:
+                return min(1 << b, self.max)
+
+        return self.max
+
+    def pack(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count / 1000 if self.count else 0.0,
+            'p50': self.percentile(0.5) / 1000,
+            'p99': self.percentile(0.99) / 1000,
+            'max': self.max / 1000,
+            'maxDepth': self.maxDepth,
+            'histogram': {(1 << b) / 1000: n for b, n in enumerate(self.buckets) if n}
+        }
+
+
+class Profiler(object):
+    """Counts the notifications passing through the board and controller and
+    records how long each dispatch takes and how deeply it is nested. Times
+    include every dispatch nested inside, so a PLAYER_MOVE that ends in rent
+    being paid also counts the RENT_PAID notification."""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clears every counter."""
+        self._counters = {}
+        self._depth = 0
+        self._depths = [0]
+
+    def dispatch(self, site, key, handler, *args):
+        """Calls handler(*args) and records it as a dispatch of the notification
+        type key at the given site."""
+        counter = self._counters.get((site, key))
+        if counter is None:
+            counter = self._counters[(site, key)] = _Counter()
+
+        self._depth += 1
+        depth = self._depth
+        start = time.perf_counter_ns()
+        try:
+            handler(*args)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self._depth -= 1
+
+            counter.count += 1
+            counter.total += elapsed
+            if elapsed > counter.max:
+                counter.max = elapsed
+            if depth > counter.maxDepth:
+                counter.maxDepth = depth
+            counter.buckets[min(elapsed.bit_length(), _BUCKETS - 1)] += 1
+
+            if depth >= len(self._depths):
+                self._depths.extend([0] * (depth + 1 - len(self._depths)))
+            self._depths[depth] += 1
+
+    def snapshot(self):
+        """Returns the counters as a dictionary. Dispatches are grouped by site,
+        then by notification type, with latencies in microseconds and the
+        histogram keyed by the upper bound of each bucket. 'depth' counts the
+        dispatches made at each nesting depth."""
+        sites = {}
+        for (site, key), counter in self._counters.items():
+            sites.setdefault(site, {})[key] = counter.pack()
+
+        return {
+            'sites': sites,
+            'depth': {d: n for d, n in enumerate(self._depths) if n}
+        }
+
+    def report(self):
+        """Returns the counters formatted as a table."""
+        lines = ['{:<30} {:<20} {:>9} {:>9} {:>9} {:>9} {:>5}'.format(
+            'site', 'notification', 'count', 'mean us', 'p99 us', 'max us', 'depth')]
+        for site, keys in sorted(self.snapshot()['sites'].items()):
+            for key, data in sorted(keys.items(), key=lambda item: -item[1]['count']):
+                lines.append('{:<30} {:<20} {:>9} {:>9.2f} {:>9.2f} {:>9.2f} {:>5}'.format(
+                    site, key, data['count'], data['mean'], data['p99'], data['max'],
+                    data['maxDepth']))
+
+        return '\n'.join(lines)
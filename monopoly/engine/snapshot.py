@@ -0,0 +1,144 @@
+#################
+# Monopoly/Engine
+# snapshot.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+import array
+import struct
+import sys
+
+from . import tile
+
+MAGIC = b'MSS1'
+# magic, board size, number of players, dice a, dice b, roll count, roll again
+_HEADER = struct.Struct('<4sHHBBBB')
+# name length, piece length, position, cash, creditor seat, debt, number of properties
+_PLAYER = struct.Struct('<HHHqhqH')
+
+
+def save(controller):
+    """Returns a binary snapshot of the game run by the given controller: the
+    tile state of the board, every player and the roll state of the move
+    command."""
+    board = controller.board
+    players = board.players
+    seats = {pl.name: seat for seat, pl in enumerate(players)}
+    rollCount, rollAgain = controller.rollState()
+    table = board.tileTable
+
+    chunks = [_HEADER.pack(MAGIC, board.size, len(players), board.diceA(), board.diceB(),
+                           rollCount, rollAgain),
+              bytes(table.mortgaged), bytes(table.levels)]
+
+    for pl in players:
+        name = pl.name.encode('utf-8')
+        piece = pl.piece.encode('utf-8')
+        creditor, debt = pl.debt if pl.debt else (None, 0)
+        creditorSeat = seats.get(creditor.name, -1) if creditor else -1
+        chunks.append(_PLAYER.pack(len(name), len(piece), pl.pos, pl.cash, creditorSeat, debt,
+                                   len(pl.properties)))
+        chunks.append(name)
+        chunks.append(piece)
+        properties = array.array('H', [t.pos for t in pl.properties])
+        # stored little-endian, like the header
+        if sys.byteorder == 'big':
+            properties.byteswap()
+        chunks.append(properties.tobytes())
+
+    return b''.join(chunks)
+
+
+def load(controller, data):
+    """Restores a snapshot returned by save() into the given controller. The
+    controller's board must use the same skin as the saved game. Raises
+    ValueError if the snapshot does not fit the board."""
+    board = controller.board
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot is truncated")
+
+    magic, size, numPlayers, diceA, diceB, rollCount, rollAgain = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a game snapshot")
+    elif size != board.size:
+        raise ValueError("Snapshot is for a board of {} tiles".format(size))
+
+    offset = _HEADER.size
+    mortgaged = data[offset:offset + size]
+    levels = data[offset + size:offset + 2 * size]
+    offset += 2 * size
+    if len(levels) != size:
+        raise ValueError("Snapshot is truncated")
+
+    players = []
+    creditors = []
+    try:
+        for _ in range(numPlayers):
+            nameLen, pieceLen, pos, cash, creditorSeat, debt, numProps = \
+                _PLAYER.unpack_from(data, offset)
+            offset += _PLAYER.size
+            name = data[offset:offset + nameLen].decode('utf-8')
+            offset += nameLen
+            piece = data[offset:offset + pieceLen].decode('utf-8')
+            offset += pieceLen
+            properties = array.array('H')
+            properties.frombytes(data[offset:offset + 2 * numProps])
+            offset += 2 * numProps
+            if len(properties) != numProps:
+                raise ValueError("Snapshot is truncated")
+            if sys.byteorder == 'big':
+                properties.byteswap()
+
+            players.append([name, piece, pos, cash, properties.tolist(), None])
+            creditors.append((creditorSeat, debt))
+    except struct.error:
+        raise ValueError("Snapshot is truncated")
+
+    # validate everything before the board is cleared
+    names = set()
+    owned = set()
+    for pl, (creditorSeat, debt) in zip(players, creditors):
+        name, _, pos, _, properties, _ = pl
+        if name in names:
+            raise ValueError("Player appears twice in snapshot: " + name)
+        elif pos >= size:
+            raise ValueError("Player {} is off the board".format(name))
+        elif creditorSeat >= numPlayers:
+            raise ValueError("Player {} owes a player not in the snapshot".format(name))
+
+        for prop in properties:
+            if prop >= size or not isinstance(board.getTile(prop), tile.OwnableTile):
+                raise ValueError("Tile {} cannot be owned".format(prop))
+            elif prop in owned:
+                raise ValueError("Tile {} is owned twice".format(prop))
+            owned.add(prop)
+
+        names.add(name)
+        if creditorSeat >= 0:
+            pl[5] = (players[creditorSeat][0], debt)
+
+    # only owned tiles may be mortgaged and only properties improved
+    for pos in range(size):
+        t = board.getTile(pos)
+        if mortgaged[pos] not in (0, 1) or (mortgaged[pos] and pos not in owned):
+            raise ValueError("Tile {} cannot be mortgaged".format(pos))
+        elif levels[pos] and (pos not in owned or not isinstance(t, tile.Property)
+                              or levels[pos] >= len(t.rents)):
+            raise ValueError("Tile {} cannot be improved to level {}".format(pos, levels[pos]))
+
+    board.restore(players, mortgaged, levels)
+    board.diceSet(diceA, diceB)
+    controller.restoreRollState(rollCount, bool(rollAgain))
+
+
+def write(controller, path):
+    """Saves a snapshot of the game to the given file."""
+    with open(path, 'wb') as f:
+        f.write(save(controller))
+
+
+def read(controller, path):
+    """Restores the game saved in the given file."""
+    with open(path, 'rb') as f:
+        load(controller, f.read())
@@ -0,0 +1,109 @@
+#################
+# Monopoly/Engine
+# test_journal.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+import os
+import random
+
+from engine import board
+from engine import controller
+from engine import dice
+from engine import journal
+from view import headless
+from view import view
+
+SKIN = os.path.join(os.path.dirname(__file__), '..', 'skin', 'standard.json')
+
+
+def playGame(path, seed, prefix, maxTurns=300):
+    """Plays a four player headless game recorded in the journal at path and
+    returns its controller."""
+    gameJournal = journal.Journal(path)
+    gameBoard = board.Board(SKIN, dice.TapeDice(random.Random(seed)))
+    gameView = headless.View(maxTurns=maxTurns)
+    gameController = controller.Controller(gameBoard, gameView, False, gameJournal=gameJournal)
+    gameView.registerController(gameController)
+    for i in range(4):
+        gameView.playerAdd('{} {}'.format(prefix, i + 1), 'Piece {}'.format(i + 1))
+    gameView.play()
+    gameJournal.close()
+    return gameController
+
+
+class Recorder(view.MonopolyView):
+    """View that keeps a state mirror and records every notification."""
+    def __init__(self):
+        super().__init__()
+        self.attachMirror(view.StateMirror())
+        self.events = []
+
+    def notifyOutOfMoves(self, data):
+        self.events.append(('OUT_OF_MOVES', data))
+
+    def notifyDiceRoll(self, data):
+        self.events.append(('DICE_ROLL', data))
+
+    def notifyBuyOpp(self, data):
+        self.events.append(('BUY_OPP', data))
+
+    def notifyPassGo(self, data):
+        self.events.append(('PASS_GO', data))
+
+    def notifyTilePurchase(self, data):
+        self.events.append(('TILE_PURCHASE', data))
+
+    def notifyInsufficientFunds(self, data):
+        self.events.append(('INSUFFICIENT_FUNDS', data))
+
+    def notifyLiquidate(self, data):
+        self.events.append(('LIQUIDATE', data))
+
+    def notifyPlayerMove(self, data):
+        self.events.append(('PLAYER_MOVE', data))
+
+    def notifyRentPaid(self, data):
+        self.events.append(('RENT_PAID', data))
+
+    def notifyMortgage(self, data):
+        self.events.append(('MORTGAGE', data))
+
+    def notifyNotOwned(self, data):
+        self.events.append(('NOT_OWNED', data))
+
+
+def test_rebuild(tmp_path):
+    path = str(tmp_path / 'game.mjn')
+    gameController = playGame(path, 1, 'Player')
+
+    players, tiles = journal.Replayer(path).rebuild()
+    assert list(players.values()) == [dict(pl) for pl in gameController.queryPlayers()]
+    assert tiles == [dict(t) for t in gameController.queryTiles()]
+
+
+def test_rebuild_last_game(tmp_path):
+    path = str(tmp_path / 'games.mjn')
+    playGame(path, 1, 'First', maxTurns=50)
+    gameController = playGame(path, 2, 'Second')
+
+    players, tiles = journal.Replayer(path).rebuild()
+    assert list(players.values()) == [dict(pl) for pl in gameController.queryPlayers()]
+    assert tiles == [dict(t) for t in gameController.queryTiles()]
+
+
+def test_drive(tmp_path):
+    path = str(tmp_path / 'game.mjn')
+    gameController = playGame(path, 3, 'Player')
+    replayer = journal.Replayer(path)
+
+    gameView = Recorder()
+    replayer.drive(gameView)
+    assert gameView.events == [(code, data) for code, data in replayer.records()
+                               if code in view.MonopolyView.NOTIFY_METHODS]
+
+    players, tiles = replayer.rebuild()
+    assert gameView.mirror.players == list(players.values())
+    assert gameView.mirror.tiles == tiles
+    assert gameView.mirror.tiles == [dict(t) for t in gameController.queryTiles()]
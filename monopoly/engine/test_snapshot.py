@@ -0,0 +1,84 @@
+#################
+# Monopoly/Engine
+# test_snapshot.py
+# 2026-10-18
+# Kelvin Wu
+#################
+
+import os
+import random
+
+import pytest
+
+from engine import board
+from engine import controller
+from engine import dice
+from engine import snapshot
+from view import headless
+
+SKIN = os.path.join(os.path.dirname(__file__), '..', 'skin', 'standard.json')
+
+
+def newGame(seed, maxTurns=0):
+    """Returns the view of a four player headless game on the standard board
+    that was stopped after maxTurns turns."""
+    gameBoard = board.Board(SKIN, dice.TapeDice(random.Random(seed)))
+    gameView = headless.View(maxTurns=maxTurns)
+    gameController = controller.Controller(gameBoard, gameView, False)
+    gameView.registerController(gameController)
+    for i in range(4):
+        gameView.playerAdd('Player {}'.format(i + 1), 'Piece {}'.format(i + 1))
+    gameView.play()
+    return gameView
+
+
+def test_round_trip():
+    saved = newGame(1, 80)
+    data = snapshot.save(saved.controller)
+
+    restored = newGame(2)
+    snapshot.load(restored.controller, data)
+
+    assert snapshot.save(restored.controller) == data
+    assert restored.controller.queryPlayers() == saved.controller.queryPlayers()
+    assert restored.controller.queryTiles() == saved.controller.queryTiles()
+
+
+def test_rejects_improved_and_mortgaged_unowned_tiles():
+    gameView = newGame(1)
+    data = bytearray(snapshot.save(gameView.controller))
+    size = gameView.controller.querySize()
+    offset = snapshot._HEADER.size
+
+    # mortgage an unowned property, mortgage Go, improve an unowned property
+    for index in (offset + 1, offset, offset + size + 1):
+        corrupted = bytearray(data)
+        corrupted[index] = 1
+        with pytest.raises(ValueError):
+            snapshot.load(gameView.controller, bytes(corrupted))
+        assert snapshot.save(gameView.controller) == data
+
+
+def test_corrupted_snapshots():
+    """A corrupted snapshot either raises ValueError and leaves the game as
+    it was, or loads into a game that can be played on."""
+    data = snapshot.save(newGame(1, 80).controller)
+    rand = random.Random(0)
+
+    for _ in range(300):
+        corrupted = bytearray(data)
+        for _ in range(rand.randint(1, 4)):
+            corrupted[rand.randrange(len(corrupted))] = rand.randrange(256)
+
+        gameView = newGame(3)
+        before = snapshot.save(gameView.controller)
+        try:
+            snapshot.load(gameView.controller, bytes(corrupted))
+        except ValueError:
+            assert snapshot.save(gameView.controller) == before
+            continue
+
+        # play on for up to 200 turns
+        gameView._maxTurns += 200
+        gameView.resume()
+        gameView.play()
@@ -10,35 +10,109 @@ import abc
 from . import notification
 
 
+class TileDef(object):
+    """Immutable definition of a tile. A single set of definitions is shared by
+    every board that uses the same skin."""
+    __slots__ = ('name', 'pos', 'tileType', 'value', 'rent')
+
+    def __init__(self, name, pos, tileType, value=None, rent=()):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'pos', pos)
+        object.__setattr__(self, 'tileType', tileType)
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'rent', rent)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TileDef is immutable")
+
+
+class TileTable(object):
+    """Mutable state of every tile on a board, indexed by tile position."""
+    __slots__ = ('owners', 'mortgaged', 'levels')
+
+    def __init__(self, size):
+        self.owners = [None] * size
+        self.mortgaged = bytearray(size)
+        self.levels = bytearray(size)
+
+    def copy(self):
+        """Returns a copy of the table. The owners are not copied."""
+        clone = TileTable.__new__(TileTable)
+        clone.owners = list(self.owners)
+        clone.mortgaged = self.mortgaged[:]
+        clone.levels = self.levels[:]
+        return clone
+
+
 class TileFactory(object):
     """Class that instantiates members of the Tile hierarchy."""
     @staticmethod
-    def makeTile(board, name, pos, tileType, data):
-        if tileType == 'basic':
-            return BasicTile(name, board, pos)
-        elif tileType == 'property':
-            return Property(name, board, pos, data['cost'], data['rent'])
+    def makeTile(board, table, tileDef):
+        if tileDef.tileType == 'basic':
+            return BasicTile(tileDef, board, table)
+        elif tileDef.tileType == 'property':
+            return Property(tileDef, board, table)
 
 
 class Tile(abc.ABC):
-    """Abstract tile class at head of hierarchy."""
-    def __init__(self, name, board, pos):
+    """Abstract tile class at head of hierarchy. Reads its fixed data from a
+    shared TileDef and its state from the board's TileTable. Fields of the
+    definition that are read on every move are copied onto the tile, so they
+    are plain attribute reads; they must not be assigned."""
+    __slots__ = ('_def', '_board', '_table', '_version', '_packed', 'name', 'pos')
+
+    def __init__(self, tileDef, board, table):
         super().__init__()
-        self._name = name
+        self._def = tileDef
         self._board = board
-        self._pos = pos
+        self._table = table
+        self._version = 0
+        self._packed = None
+        self._cacheDef()
+
+    def _cacheDef(self):
+        self.name = self._def.name
+        self.pos = self._def.pos
 
     @property
-    def name(self):
-        return self._name
+    def definition(self):
+        return self._def
 
     @property
-    def pos(self):
-        return self._pos
+    def version(self):
+        """Counter that is incremented whenever the packed state changes."""
+        return self._version
+
+    def _touch(self):
+        self._version += 1
+        self._packed = None
+        self._board.tileChanged(self._def.pos)
+
+    def fork(self, board, table):
+        """Returns a copy of the tile for a forked board. The copy shares the
+        definition and the cached pack, which stays valid until either tile
+        changes."""
+        clone = object.__new__(type(self))
+        clone._def = self._def
+        clone._board = board
+        clone._table = table
+        clone._version = self._version
+        clone._packed = self._packed
+        clone._cacheDef()
+        return clone
 
     def pack(self):
-        """Returns a dictionary containing the state information of the tile."""
-        return {'name': self._name, 'pos': self._pos}
+        """Returns a dictionary containing the state information of the tile.
+        The dictionary is cached until the state changes, so it must not be
+        modified."""
+        if self._packed is None:
+            self._packed = self._pack()
+
+        return self._packed
+
+    def _pack(self):
+        """Builds the dictionary returned by pack()."""
+        return {'name': self.name, 'pos': self.pos}
 
     @abc.abstractmethod
     def action(self, player):
@@ -52,8 +126,7 @@ class Tile(abc.ABC):
 
 class BasicTile(Tile):
     """A basic tile that does nothing when the player lands on it."""
-    def __init__(self, name, board, pos):
-        super().__init__(name, board, pos)
+    __slots__ = ()
 
     def action(self, player):
         pass
@@ -61,42 +134,45 @@ class BasicTile(Tile):
 
 class OwnableTile(Tile):
     """Represents a tile that can be owned by a player."""
-    def __init__(self, name, board, pos, value, owner=None, isOwned=False,
-                 mortgaged=False):
-        super().__init__(name, board, pos)
-        self._isOwned = isOwned
-        self._value = value
-        self._owner = owner
-        self._mortgaged = mortgaged
+    __slots__ = ('value', 'summary')
 
-    @property
-    def isOwned(self):
-        return self._isOwned
+    def _cacheDef(self):
+        super()._cacheDef()
+        self.value = self._def.value
+        # the entry for this tile in the property list of a player pack
+        self.summary = {'name': self.name, 'value': self.value}
 
     @property
-    def value(self):
-        return self._value
+    def isOwned(self):
+        return self._table.owners[self.pos] is not None
 
     @property
     def owner(self):
-        return self._owner
+        return self._table.owners[self.pos]
 
     @owner.setter
     def owner(self, owner):
-        self._owner = owner
+        self._table.owners[self.pos] = owner
+        self._touch()
 
-    def pack(self):
-        data = super().pack()
-        data['isOwned'] = self._isOwned
-        data['value'] = self._value
-        data['owner'] = self._owner.name if self._owner else None
-        data['mortgaged'] = self._mortgaged
+    @property
+    def mortgaged(self):
+        return bool(self._table.mortgaged[self.pos])
+
+    def _pack(self):
+        data = super()._pack()
+        owner = self._table.owners[self.pos]
+        data['isOwned'] = owner is not None
+        data['value'] = self.value
+        data['owner'] = owner.name if owner else None
+        data['mortgaged'] = self.mortgaged
         return data
 
     def action(self, player):
-        if self._mortgaged:
+        pos = self.pos
+        if self._table.mortgaged[pos]:
             return
-        elif self._owner:
+        elif self._table.owners[pos]:
             self.charge(player)
         else:
             self.pushNotification(notification.TNBuyOpp(player, self))
@@ -108,41 +184,47 @@ class OwnableTile(Tile):
 
     def mortgage(self):
         """Switches this tile to mortgage mode."""
-        self._mortgaged = True
+        self._table.mortgaged[self.pos] = 1
+        self._touch()
 
     def unmortgage(self):
         """Switches this tile off of mortgage mode."""
-        self._mortgaged = False
+        self._table.mortgaged[self.pos] = 0
+        self._touch()
 
 
 class Property(OwnableTile):
     """A tile that represents a property that charges rent."""
-    def __init__(self, name, board, pos, value, rent, owner=None, isOwned=False, 
-                 level=0, mortgaged=False):
-        super().__init__(name, board, pos, value, owner, isOwned, mortgaged)
-        self._rent = rent
-        self._improvementLevel = level
+    __slots__ = ('rents',)
+
+    def _cacheDef(self):
+        super()._cacheDef()
+        # the rent charged at each improvement level
+        self.rents = self._def.rent
 
     @property
     def rent(self):
-        return self._rent[self._improvementLevel]
+        return self.rents[self._table.levels[self.pos]]
 
-    def pack(self):
-        data = super().pack()
+    @property
+    def improvementLevel(self):
+        return self._table.levels[self.pos]
+
+    def _pack(self):
+        data = super()._pack()
         data['rent'] = self.rent
-        data['improvementLevel'] = self._improvementLevel
+        data['improvementLevel'] = self.improvementLevel
         return data
 
     def charge(self, player):
-        player.payRent(self._owner, self.rent)
+        pos = self.pos
+        player.payRent(self._table.owners[pos], self.rents[self._table.levels[pos]])
 
 
 # TODO
 class Utility(OwnableTile):
     """A tile that charges players according to a random die roll."""
-    def __init__(self, name, board, pos, value, owner=None, isOwned=False,
-                 mortgaged=False):
-        super().__init__(name, board, pos, value, owner, isOwned, mortgaged)
+    __slots__ = ()
 
     def charge(self, player):
         pass
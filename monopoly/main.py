@@ -8,9 +8,17 @@
 
 import argparse
 import importlib
+import sys
 
 from engine import board
 from engine import controller
+from engine import dice
+from engine import journal
+from engine import profiler
+from sim import advisor
+from sim import batch
+from sim import runner
+from sim import tournament
 
 VIEWS = {'textview_min'}
 
@@ -22,12 +30,87 @@ if __name__ == '__main__':
     mparser.add_argument('--view', help="enter the name of a view module to use",
                          default='textview_min')
     mparser.add_argument('-d', '--debug', help="enter debug mode", action='store_true')
+    mparser.add_argument('--script', help=("read commands and answers from the given file "
+                                           "instead of the console"))
+    mparser.add_argument('--quiet', help="only print the result of a scripted game",
+                         action='store_true')
+    mparser.add_argument('--delta', help="send only changed fields in view notifications",
+                         action='store_true')
+    mparser.add_argument('--queued', help=("queue model notifications and send the view one "
+                                           "batch per command"),
+                         action='store_true')
+    mparser.add_argument('--headless', help="play games without a view or user input",
+                         action='store_true')
+    mparser.add_argument('--games', help="number of games to play in headless mode",
+                         type=int, default=1)
+    mparser.add_argument('--players', help="number of players in headless mode",
+                         type=int, default=4)
+    mparser.add_argument('--max-turns', help="turn limit for each headless game",
+                         type=int, default=1000)
+    mparser.add_argument('--seed', help="seed the dice of headless games for reproducible runs", type=int)
+    mparser.add_argument('--workers', help=("number of processes used to play headless "
+                                            "games (0 uses every core)"),
+                         type=int, default=1)
+    mparser.add_argument('--batch', help=("play headless games in lockstep with the "
+                                          "struct-of-arrays batch engine"),
+                         action='store_true')
+    mparser.add_argument('--journal', help="append a record of the game to the given file")
+    mparser.add_argument('--record-dice', help="save the dice rolls of the game to the given file")
+    mparser.add_argument('--replay-dice', help="replay the dice rolls saved in the given file")
+    mparser.add_argument('--advise', help=("show the advice of a lookahead advisor playing the "
+                                           "given number of rollouts on every purchase"),
+                         type=int, default=0)
+    mparser.add_argument('--profile', help=("count and time the notifications of the game "
+                                            "and print a report at the end"),
+                         action='store_true')
     args = mparser.parse_args()
+    gameProfiler = profiler.Profiler() if args.profile else None
+
+    if args.headless:
+        if args.profile and (args.batch or args.seed is not None or args.workers != 1):
+            print("--profile only applies to unseeded games played in a single process")
+            raise SystemExit
+
+        try:
+            if args.batch:
+                stats = batch.run('skin/' + args.skin + '.json', args.games,
+                                  args.players, args.max_turns,
+                                  args.seed if args.seed is not None else 0)
+            elif args.seed is None and args.workers == 1:
+                stats = runner.run('skin/' + args.skin + '.json', args.games,
+                                   args.players, args.max_turns, gameProfiler)
+            else:
+                stats = tournament.run('skin/' + args.skin + '.json', args.games,
+                                       args.players, args.max_turns,
+                                       args.seed if args.seed is not None else 0,
+                                       args.workers)
+        except (OSError, ValueError):
+            print("Invalid JSON file: " + args.skin)
+            raise SystemExit
+
+        print("Played {} games ({} turns) in {:.3f}s.".format(stats['games'], stats['turns'],
+                                                            stats['seconds']))
+        print("{:.1f} games/sec, {:.1f} turns/sec.".format(stats['gamesPerSec'],
+                                                           stats['turnsPerSec']))
+        if gameProfiler:
+            print(gameProfiler.report())
+        raise SystemExit
+
+    # initialize dice
+    gameDice = None
+    try:
+        if args.replay_dice:
+            gameDice = dice.TapeDice.load(args.replay_dice)
+        elif args.record_dice:
+            gameDice = dice.TapeDice()
+    except (OSError, ValueError):
+        print("Invalid dice tape: " + args.replay_dice)
+        raise SystemExit
 
     # initialize gameBoard
     gameBoard = None
     try:
-        gameBoard = board.Board('skin/' + args.skin + '.json')
+        gameBoard = board.Board('skin/' + args.skin + '.json', gameDice)
     except:
         print("Invalid JSON file: " + args.skin)
         raise SystemExit
@@ -35,9 +118,30 @@ if __name__ == '__main__':
     # import appropriate view
     if args.view in VIEWS:
         view = importlib.import_module('view.' + args.view)
-        gameView = view.View()
-        gameController = controller.Controller(gameBoard, gameView, args.debug)
+        try:
+            script = open(args.script) if args.script else None
+        except OSError:
+            print("Unable to open script: " + args.script)
+            raise SystemExit
+
+        if script is None and not sys.stdin.isatty():
+            # commands are piped in
+            script = sys.stdin
+        gameView = view.View(script, args.quiet)
+        gameJournal = journal.Journal(args.journal) if args.journal else None
+        gameController = controller.Controller(gameBoard, gameView, args.debug, args.delta,
+                                               gameJournal, gameProfiler, args.queued)
         gameView.registerController(gameController)
-        gameView.play()
+        if args.advise:
+            gameView.advisor = advisor.Advisor(args.advise, budget=0.5)
+        try:
+            gameView.play()
+        finally:
+            if args.record_dice:
+                gameDice.save(args.record_dice)
+            if gameJournal:
+                gameJournal.close()
+            if gameProfiler:
+                print(gameProfiler.report())
     else:
         print("Unable to locate view: " + args.view)
@@ -0,0 +1,274 @@
+##################
+# Monopoly/Server
+# asyncserver.py
+# 2026-10-18
+# Kelvin Wu
+##################
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from engine import board
+from engine import controller
+from engine import tile
+from view import remote
+from . import stats
+
+SKIN_DIR = 'skin'
+
+
+class HostedGame(object):
+    """A game hosted by the server, along with the turn state the server
+    enforces: whose turn it is and whether they have an unanswered offer to
+    buy the tile they landed on."""
+    def __init__(self, gameController, gameView):
+        self.controller = gameController
+        self.view = gameView
+        self._seat = 0
+        self._offer = False
+
+    @property
+    def over(self):
+        """Returns true once fewer than two players remain."""
+        return len(self.controller.board.players) < 2
+
+    @property
+    def current(self):
+        """Returns the name of the player whose turn it is."""
+        players = self.controller.board.players
+        return players[self._seat % len(players)].name
+
+    def checkTurn(self, player):
+        """Raises ValueError unless it is the given player's turn."""
+        if player != self.current:
+            raise ValueError("It is {}'s turn".format(self.current))
+
+    def checkSolvent(self, player):
+        """Raises ValueError if the player owes rent they could not pay."""
+        if self.controller.board.getPlayer(player).debt:
+            raise ValueError("{} must pay their debt first".format(player))
+
+    def roll(self, player):
+        self.checkTurn(player)
+        self.checkSolvent(player)
+        self.controller.playerMove(player)
+        # landing on an unowned tile is an offer to buy it, which lapses on
+        # the next roll or at the end of the turn
+        gameBoard = self.controller.board
+        t = gameBoard.getTile(gameBoard.getPlayer(player).pos)
+        self._offer = isinstance(t, tile.OwnableTile) and not t.isOwned
+
+    def purchase(self, player):
+        self.checkTurn(player)
+        if not self._offer:
+            raise ValueError("{} has no offer to buy a tile".format(player))
+
+        self._offer = False
+        self.controller.playerPurchase(player)
+
+    def mortgage(self, player, name):
+        self.checkTurn(player)
+        self.controller.playerMortgage(player, name)
+
+    def next(self, player):
+        self.checkTurn(player)
+        self.checkSolvent(player)
+        self.controller.resetCommandState()
+        self._offer = False
+        self._seat = (self._seat + 1) % len(self.controller.board.players)
+
+    def bankrupt(self, player, other):
+        """Takes the current player out of the game, handing their assets to
+        the player they owe, or to the bank. The turn passes to the next
+        player, unless the game is over."""
+        self.checkTurn(player)
+        debt = self.controller.board.getPlayer(player).debt
+        creditor = debt[0].name if debt and debt[0] else None
+        if other != creditor:
+            raise ValueError("{} owes {}".format(player, creditor or "the bank"))
+
+        self.controller.playerBankrupt(player, other)
+        self.controller.resetCommandState()
+        self._offer = False
+        if not self.over:
+            self._seat %= len(self.controller.board.players)
+
+
+class GameServer(object):
+    """Hosts many games in one event loop and exposes the controller commands
+    over a line-oriented JSON protocol. Each request is a JSON object on its
+    own line with an 'op' field; each response is a JSON object on its own
+    line with an 'ok' field, echoing the request's 'id' if one was given.
+
+    Ops: new (skin, players, delta), roll, purchase, mortgage (tile), next,
+    bankrupt (other), query, close and stats. Commands name the player
+    issuing them and are only accepted on that player's turn; purchase also
+    needs an offer to buy from the player's last roll. Commands return the
+    notifications they caused as 'events'. Games are closed when the
+    connection that created them closes, or when a bankruptcy leaves a single
+    player, in which case the response is marked 'closed' and names the
+    'winner'."""
+    def __init__(self, skinDir=SKIN_DIR):
+        self._skinDir = skinDir
+        self._games = {}
+        self._ids = itertools.count(1)
+        self._latency = stats.LatencyRecorder()
+        self._ops = {
+            'new': self._opNew,
+            'roll': self._opRoll,
+            'purchase': self._opPurchase,
+            'mortgage': self._opMortgage,
+            'next': self._opNext,
+            'bankrupt': self._opBankrupt,
+            'query': self._opQuery,
+            'close': self._opClose,
+            'stats': self._opStats
+        }
+
+    @property
+    def games(self):
+        return len(self._games)
+
+    def dispatch(self, request, connection=None):
+        """Executes a decoded request and returns the response. Games created
+        by the request are added to the connection, a set of game ids, if one
+        is given."""
+        start = time.perf_counter()
+        try:
+            op = self._ops[request['op']]
+            response = op(request)
+            if connection is not None and request['op'] == 'new':
+                connection.add(response['game'])
+            elif connection is not None and (request['op'] == 'close' or
+                                             response.get('closed')):
+                connection.discard(request['game'])
+            response['ok'] = True
+        except (AttributeError, KeyError, TypeError, ValueError, OSError) as e:
+            response = {'ok': False, 'error': '{}: {}'.format(type(e).__name__, e)}
+
+        if 'id' in request:
+            response['id'] = request['id']
+
+        self._latency.add(time.perf_counter() - start)
+        return response
+
+    def _game(self, request):
+        return self._games[request['game']]
+
+    def _opNew(self, request):
+        skin = request.get('skin', 'standard')
+        if os.path.basename(skin) != skin:
+            raise ValueError("Invalid skin: " + skin)
+        elif len(request['players']) < 2:
+            raise ValueError("A game needs at least 2 players")
+
+        gameBoard = board.Board(os.path.join(self._skinDir, skin + '.json'))
+        gameView = remote.View()
+        gameController = controller.Controller(gameBoard, gameView, False,
+                                               bool(request.get('delta', False)),
+                                               queued=True)
+        gameView.registerController(gameController)
+        for name, piece in request['players']:
+            gameController.playerAdd(name, piece)
+
+        gameId = next(self._ids)
+        self._games[gameId] = HostedGame(gameController, gameView)
+        return {'game': gameId}
+
+    def _opRoll(self, request):
+        game = self._game(request)
+        game.roll(request['player'])
+        return {'events': game.view.drain()}
+
+    def _opPurchase(self, request):
+        game = self._game(request)
+        game.purchase(request['player'])
+        return {'events': game.view.drain()}
+
+    def _opMortgage(self, request):
+        game = self._game(request)
+        game.mortgage(request['player'], request['tile'])
+        return {'events': game.view.drain()}
+
+    def _opNext(self, request):
+        game = self._game(request)
+        game.next(request['player'])
+        return {'events': game.view.drain()}
+
+    def _opBankrupt(self, request):
+        game = self._game(request)
+        game.bankrupt(request['player'], request.get('other'))
+        response = {'events': game.view.drain()}
+        if game.over:
+            del self._games[request['game']]
+            response['closed'] = True
+            response['winner'] = game.current
+        return response
+
+    def _opQuery(self, request):
+        gameController = self._game(request).controller
+        return {
+            'size': gameController.querySize(),
+            'style': gameController.queryStyle(),
+            'currency': dict(gameController.queryCurrency()),
+            'tiles': [dict(t) for t in gameController.queryTiles()]
+        }
+
+    def _opClose(self, request):
+        del self._games[request['game']]
+        return {}
+
+    def _opStats(self, request):
+        snapshot = self._latency.snapshot()
+        snapshot['games'] = len(self._games)
+        return snapshot
+
+    async def handle(self, reader, writer):
+        """Serves one client connection until it closes, then closes the games
+        it created."""
+        connection = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be an object")
+                except ValueError as e:
+                    response = {'ok': False, 'error': 'ValueError: {}'.format(e)}
+                else:
+                    response = self.dispatch(request, connection)
+
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for gameId in connection:
+                self._games.pop(gameId, None)
+            writer.close()
+
+    async def serve(self, host, port):
+        """Accepts connections until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port, limit=1 << 20)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    mparser = argparse.ArgumentParser()
+    mparser.add_argument('--host', help="address to listen on", default='127.0.0.1')
+    mparser.add_argument('--port', help="port to listen on", type=int, default=8765)
+    args = mparser.parse_args()
+
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,123 @@
+##################
+# Monopoly/Server
+# loadgen.py
+# 2026-10-18
+# Kelvin Wu
+##################
+
+import argparse
+import asyncio
+import json
+import time
+
+
+class Client(object):
+    """Connection to a GameServer that sends one request at a time and records
+    the round trip latency of each."""
+    def __init__(self, reader, writer, latencies):
+        self._reader = reader
+        self._writer = writer
+        self._latencies = latencies
+
+    async def request(self, **request):
+        start = time.perf_counter()
+        self._writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        self._latencies.append(time.perf_counter() - start)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+
+        return response
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def playGame(client, skin, numPlayers, turns):
+    """Plays a game over the connection, buying every property the current
+    player can afford and going bankrupt whenever rent cannot be paid."""
+    names = ['Player {}'.format(i + 1) for i in range(numPlayers)]
+    game = (await client.request(op='new', skin=skin,
+                                 players=[[name, 'Piece'] for name in names]))['game']
+    seat = 0
+    for turn in range(turns):
+        player = names[seat]
+        rollAgain = True
+        while rollAgain and player in names:
+            events = (await client.request(op='roll', game=game, player=player))['events']
+            for event in events:
+                if event['code'] == 'DICE_ROLL':
+                    rollAgain = event['data']['rollAgain']
+                elif event['code'] == 'OUT_OF_MOVES':
+                    rollAgain = False
+                elif event['code'] == 'BUY_OPP':
+                    if event['data']['tile']['value'] <= event['data']['player']['cash']:
+                        await client.request(op='purchase', game=game, player=player)
+                elif event['code'] == 'LIQUIDATE':
+                    response = await client.request(op='bankrupt', game=game, player=player,
+                                                    other=event['data']['other']['name'])
+                    names.remove(player)
+                    # the server closes a game once a single player is left
+                    if response.get('closed'):
+                        return
+
+        # a bankrupt player's turn ends with them, and the next player takes
+        # their seat
+        if player in names:
+            await client.request(op='next', game=game, player=player)
+            seat = (seat + 1) % len(names)
+        else:
+            seat %= len(names)
+
+    await client.request(op='close', game=game)
+
+
+async def runClient(host, port, games, skin, numPlayers, turns, latencies):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    client = Client(reader, writer, latencies)
+    for _ in range(games):
+        await playGame(client, skin, numPlayers, turns)
+
+    await client.close()
+
+
+async def run(host, port, connections, games, skin='standard', numPlayers=4, turns=100):
+    """Opens the given number of connections, each playing games one after
+    another, and returns latency and throughput statistics."""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[runClient(host, port, games, skin, numPlayers, turns, latencies)
+                           for _ in range(connections)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requestsPerSec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'max': latencies[-1] * 1000
+    }
+
+
+if __name__ == '__main__':
+    mparser = argparse.ArgumentParser()
+    mparser.add_argument('--host', help="address of the server", default='127.0.0.1')
+    mparser.add_argument('--port', help="port of the server", type=int, default=8765)
+    mparser.add_argument('--connections', help="number of concurrent connections",
+                         type=int, default=100)
+    mparser.add_argument('--games', help="games played by each connection", type=int, default=1)
+    mparser.add_argument('--players', help="number of players in each game", type=int, default=4)
+    mparser.add_argument('--turns', help="turns played in each game", type=int, default=100)
+    mparser.add_argument('--skin', help="name of the JSON file to load", default='standard')
+    args = mparser.parse_args()
+
+    stats = asyncio.run(run(args.host, args.port, args.connections, args.games, args.skin,
+                            args.players, args.turns))
+    print("{} requests in {:.3f}s ({:.0f}/sec).".format(stats['requests'], stats['seconds'],
+                                                       stats['requestsPerSec']))
+    print("Latency p50 {:.2f}ms, p99 {:.2f}ms, max {:.2f}ms.".format(stats['p50'], stats['p99'],
+                                                                   stats['max']))
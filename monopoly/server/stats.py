@@ -0,0 +1,41 @@
+##################
+# Monopoly/Server
+# stats.py
+# 2026-10-18
+# Kelvin Wu
+##################
+
+
+class LatencyRecorder(object):
+    """Keeps a bounded window of recent command latencies."""
+    def __init__(self, window=100000):
+        self._window = window
+        self._samples = []
+        self._next = 0
+        self._count = 0
+        self._total = 0.0
+
+    def add(self, seconds):
+        if len(self._samples) < self._window:
+            self._samples.append(seconds)
+        else:
+            self._samples[self._next] = seconds
+            self._next = (self._next + 1) % self._window
+
+        self._count += 1
+        self._total += seconds
+
+    def snapshot(self):
+        """Returns the command count, the overall mean latency and the p50, p99
+        and maximum latency of the window, in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+
+        return {
+            'count': self._count,
+            'mean': self._total / self._count * 1000,
+            'p50': samples[len(samples) // 2] * 1000,
+            'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            'max': samples[-1] * 1000
+        }
@@ -0,0 +1,91 @@
+##################
+# Monopoly/Server
+# test_asyncserver.py
+# 2026-10-18
+# Kelvin Wu
+##################
+
+import os
+
+from server import asyncserver
+
+SKIN_DIR = os.path.join(os.path.dirname(__file__), '..', 'skin')
+
+
+def newGame(server, numPlayers, connection=None):
+    response = server.dispatch({'op': 'new', 'players': [['Player {}'.format(i + 1), 'Piece']
+                                                         for i in range(numPlayers)]},
+                               connection)
+    assert response['ok'], response
+    return response['game']
+
+
+def command(server, game, op, player, connection=None, **request):
+    return server.dispatch(dict(request, op=op, game=game, player=player), connection)
+
+
+def test_rejects_too_few_players():
+    server = asyncserver.GameServer(SKIN_DIR)
+    for players in ([], [['Player 1', 'Piece']]):
+        response = server.dispatch({'op': 'new', 'players': players})
+        assert not response['ok']
+        assert response['error'].startswith('ValueError')
+    assert server.games == 0
+
+
+def test_turn_order():
+    server = asyncserver.GameServer(SKIN_DIR)
+    game = newGame(server, 3)
+
+    assert not command(server, game, 'roll', 'Player 2')['ok']
+    assert not command(server, game, 'next', 'Player 2')['ok']
+    assert command(server, game, 'next', 'Player 1')['ok']
+    assert not command(server, game, 'roll', 'Player 1')['ok']
+    assert command(server, game, 'roll', 'Player 2')['ok']
+    assert command(server, game, 'next', 'Player 2')['ok']
+    assert command(server, game, 'next', 'Player 3')['ok']
+    assert command(server, game, 'next', 'Player 1')['ok']
+
+
+def test_purchase_needs_offer():
+    server = asyncserver.GameServer(SKIN_DIR)
+    game = newGame(server, 2)
+    hosted = server._games[game]
+
+    assert not command(server, game, 'purchase', 'Player 1')['ok']
+    for _ in range(20):
+        events = command(server, game, 'roll', hosted.current)['events']
+        offered = any(event['code'] == 'BUY_OPP' for event in events)
+        assert command(server, game, 'purchase', hosted.current)['ok'] == offered
+        # an offer can only be taken once
+        assert not command(server, game, 'purchase', hosted.current)['ok']
+        assert command(server, game, 'next', hosted.current)['ok']
+
+
+def test_bankrupt_last_seat():
+    server = asyncserver.GameServer(SKIN_DIR)
+    game = newGame(server, 3)
+    hosted = server._games[game]
+    for player in ('Player 1', 'Player 2'):
+        command(server, game, 'next', player)
+
+    hosted.controller.board.getPlayer('Player 3').debt = (None, 100)
+    assert not command(server, game, 'bankrupt', 'Player 3', other='Player 1')['ok']
+    response = command(server, game, 'bankrupt', 'Player 3', other=None)
+    assert response['ok'] and 'closed' not in response
+    assert hosted.current == 'Player 1'
+
+
+def test_last_bankruptcy_closes_game():
+    server = asyncserver.GameServer(SKIN_DIR)
+    connection = set()
+    game = newGame(server, 2, connection)
+    hosted = server._games[game]
+
+    hosted.controller.board.getPlayer('Player 1').debt = (None, 100)
+    response = command(server, game, 'bankrupt', 'Player 1', connection, other=None)
+    assert response['ok'] and response['closed']
+    assert response['winner'] == 'Player 2'
+    assert server.games == 0
+    assert game not in connection
+    assert not command(server, game, 'roll', 'Player 2')['ok']
@@ -0,0 +1,165 @@
+##################
+# Monopoly/Server
+# threadhost.py
+# 2026-10-18
+# Kelvin Wu
+##################
+
+import collections
+import concurrent.futures
+import itertools
+import os
+import threading
+import time
+
+from engine import board
+from engine import controller
+from view import remote
+from . import stats
+
+
+class GameActor(object):
+    """Owns a single game. Commands are queued and run one after another on a
+    pool thread, so the game's Board, Players and Controller are only ever
+    touched by one thread at a time. The lock only guards the queue."""
+    def __init__(self, gameController, gameView, executor, batchSize=32):
+        self._controller = gameController
+        self._view = gameView
+        self._executor = executor
+        self._batchSize = batchSize
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._latency = stats.LatencyRecorder(window=256)
+
+    @property
+    def depth(self):
+        """Returns the number of commands waiting to run."""
+        return len(self._queue)
+
+    def submit(self, command, *args):
+        """Queues a function to be called with the game's controller, view and
+        the given arguments. Returns a Future holding its result."""
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._queue.append((command, args, future, time.perf_counter()))
+            if not self._scheduled:
+                self._scheduled = True
+                self._executor.submit(self._run)
+
+        return future
+
+    def _run(self):
+        # run a batch, then yield the thread so other games get their turn
+        for _ in range(self._batchSize):
+            with self._lock:
+                if not self._queue:
+                    self._scheduled = False
+                    return
+
+                command, args, future, queued = self._queue.popleft()
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(command(self._controller, self._view, *args))
+                except Exception as e:
+                    future.set_exception(e)
+
+            self._latency.add(time.perf_counter() - queued)
+
+        self._executor.submit(self._run)
+
+    def stats(self):
+        """Returns the queue depth and command latency of the game."""
+        snapshot = self._latency.snapshot()
+        snapshot['queued'] = len(self._queue)
+        return snapshot
+
+
+def _roll(gameController, gameView, player):
+    gameController.playerMove(player)
+    return gameView.drain()
+
+
+def _purchase(gameController, gameView, player):
+    gameController.playerPurchase(player)
+    return gameView.drain()
+
+
+def _mortgage(gameController, gameView, player, tile):
+    gameController.playerMortgage(player, tile)
+    return gameView.drain()
+
+
+def _next(gameController, gameView):
+    gameController.resetCommandState()
+    return gameView.drain()
+
+
+def _bankrupt(gameController, gameView, player, other):
+    gameController.playerBankrupt(player, other)
+    return gameView.drain()
+
+
+class GameHost(object):
+    """Drives many games from a thread pool. Each game is a GameActor, so no
+    lock is shared between games. Command methods return a Future holding the
+    notifications the command caused, in the format of view.remote.View."""
+    def __init__(self, workers=None, skinDir='skin'):
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self._skinDir = skinDir
+        self._games = {}
+        self._ids = itertools.count(1)
+
+    def newGame(self, players, skin='standard', deltaMode=False, gameDice=None):
+        """Creates a game for the given (name, piece) pairs. Returns its id."""
+        gameBoard = board.Board(os.path.join(self._skinDir, skin + '.json'), gameDice)
+        gameView = remote.View()
+        gameController = controller.Controller(gameBoard, gameView, False, deltaMode,
+                                               queued=True)
+        gameView.registerController(gameController)
+        for name, piece in players:
+            gameController.playerAdd(name, piece)
+
+        gameId = next(self._ids)
+        self._games[gameId] = GameActor(gameController, gameView, self._executor)
+        return gameId
+
+    def closeGame(self, gameId):
+        del self._games[gameId]
+
+    def submit(self, gameId, command, *args):
+        """Queues an arbitrary function to be called with the game's controller,
+        view and the given arguments."""
+        return self._games[gameId].submit(command, *args)
+
+    def roll(self, gameId, player):
+        return self.submit(gameId, _roll, player)
+
+    def purchase(self, gameId, player):
+        return self.submit(gameId, _purchase, player)
+
+    def mortgage(self, gameId, player, tile):
+        return self.submit(gameId, _mortgage, player, tile)
+
+    def next(self, gameId):
+        return self.submit(gameId, _next)
+
+    def bankrupt(self, gameId, player, other):
+        return self.submit(gameId, _bankrupt, player, other)
+
+    def queueDepth(self):
+        """Returns the number of commands waiting across all games."""
+        return sum(actor.depth for actor in list(self._games.values()))
+
+    def stats(self, gameId=None):
+        """Returns the queue depth and command latency of one game, or the total
+        queue depth and the statistics of every game."""
+        if gameId is not None:
+            return self._games[gameId].stats()
+
+        games = {gid: actor.stats() for gid, actor in list(self._games.items())}
+        return {'queued': sum(s['queued'] for s in games.values()), 'games': games}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait)
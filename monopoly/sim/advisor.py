@@ -0,0 +1,133 @@
+################
+# Monopoly/Sim
+# advisor.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import argparse
+import random
+import time
+
+from engine import board
+from engine import controller
+from engine import dice
+from view import headless
+
+
+def netWorth(player):
+    """Returns the cash of a player plus what their properties would raise if
+    mortgaged."""
+    return player.cash + sum(0 if t.mortgaged else t.value // 2 for t in player.properties)
+
+
+class Advisor(object):
+    """Decides whether a player should buy the tile they landed on by playing
+    the game out from the current position, once after buying and once after
+    passing, over many rollouts. Each rollout plays a forked game for a number
+    of turns with the given provider making every decision. Both options of a
+    rollout roll the same dice."""
+    def __init__(self, rollouts=200, turns=40, provider=None, budget=None, seed=None):
+        self._rollouts = rollouts
+        self._turns = turns
+        self._provider = provider if provider else headless.DecisionProvider()
+        self._budget = budget
+        self._rng = random.Random(seed)
+
+    def advise(self, gameController, player):
+        """Returns the expected gain from buying the tile player stands on, as a
+        dictionary with the mean score after buying and after passing, their
+        difference and the number of rollouts played. A score is the player's
+        net worth less the mean net worth of the other players. If a budget
+        was given, stops once it has been used up."""
+        names = [pl.name for pl in gameController.board.players]
+        turn = (names.index(player) + 1) % len(names)
+        deadline = time.perf_counter() + self._budget if self._budget else None
+        totals = [0.0, 0.0]
+        played = 0
+
+        for _ in range(self._rollouts):
+            seed = self._rng.getrandbits(64)
+            totals[0] += self._rollout(gameController, player, True, seed, turn)
+            totals[1] += self._rollout(gameController, player, False, seed, turn)
+            played += 1
+            if deadline and time.perf_counter() > deadline:
+                break
+
+        buy, dontBuy = totals[0] / played, totals[1] / played
+        return {'buy': buy, 'pass': dontBuy, 'gain': buy - dontBuy, 'rollouts': played}
+
+    def _rollout(self, gameController, player, buy, seed, turn):
+        rolloutView = headless.View(self._provider, self._turns)
+        child = gameController.fork(rolloutView, dice.Dice(random.Random(seed)))
+        rolloutView.registerController(child)
+        rolloutView.resume()
+        if buy:
+            child.playerPurchase(player)
+
+        child.resetCommandState()
+        rolloutView.play(turn)
+
+        worths = {pl.name: netWorth(pl) for pl in child.board.players}
+        mine = worths.pop(player, 0)
+        return mine - sum(worths.values()) / len(worths) if worths else mine
+
+
+class Lookahead(headless.DecisionProvider):
+    """Buys a tile when the advisor expects buying to pay off. Must be bound
+    to the controller of the game before it is asked anything."""
+    def __init__(self, advisor=None):
+        self._advisor = advisor if advisor else Advisor()
+        self._controller = None
+
+    def bind(self, gameController):
+        self._controller = gameController
+
+    def buy(self, player, tile):
+        if tile['value'] > player['cash']:
+            return False
+
+        return self._advisor.advise(self._controller, player['name'])['gain'] > 0
+
+
+if __name__ == '__main__':
+    aparser = argparse.ArgumentParser(description="Play a game with a lookahead player.")
+    aparser.add_argument('--skin', default='standard')
+    aparser.add_argument('--players', type=int, default=4)
+    aparser.add_argument('--max-turns', type=int, default=200)
+    aparser.add_argument('--rollouts', type=int, default=200)
+    aparser.add_argument('--turns', type=int, default=40, help="turns played per rollout")
+    aparser.add_argument('--seed', type=int, default=0)
+    args = aparser.parse_args()
+
+    latencies = []
+
+    class TimedAdvisor(Advisor):
+        def advise(self, gameController, player):
+            start = time.perf_counter()
+            advice = super().advise(gameController, player)
+            latencies.append(time.perf_counter() - start)
+            return advice
+
+    lookahead = Lookahead(TimedAdvisor(args.rollouts, args.turns, seed=args.seed))
+    gameBoard = board.Board('skin/' + args.skin + '.json',
+                            dice.TapeDice(random.Random(args.seed)))
+    gameView = headless.View(maxTurns=args.max_turns)
+    gameController = controller.Controller(gameBoard, gameView, False)
+    gameView.registerController(gameController)
+    lookahead.bind(gameController)
+
+    gameView.playerAdd('Lookahead', 'Piece 1', lookahead)
+    for i in range(1, args.players):
+        gameView.playerAdd('Player {}'.format(i + 1), 'Piece {}'.format(i + 1))
+
+    start = time.perf_counter()
+    gameView.play()
+    print("Played {} turns in {:.1f}s. Winner: {}.".format(gameView.turns,
+                                                          time.perf_counter() - start,
+                                                          gameView.winner))
+    if latencies:
+        latencies.sort()
+        print("{} decisions, {} rollouts each: median {:.0f}ms, max {:.0f}ms.".format(
+            len(latencies), args.rollouts, latencies[len(latencies) // 2] * 1000,
+            latencies[-1] * 1000))
@@ -0,0 +1,117 @@
+################
+# Monopoly/Sim
+# evaluate.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import argparse
+import math
+import os
+import time
+
+from . import policy
+from . import runner
+from . import tournament
+
+
+def wilson(wins, games, z=1.96):
+    """Returns the Wilson score interval (low, high) of a win rate. The default
+    z gives a 95% interval."""
+    if not games:
+        return 0.0, 1.0
+
+    p = wins / games
+    denom = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denom
+    spread = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+def seating(index, numPolicies):
+    """Returns the policy index sitting in each seat of game index. Policies
+    rotate through the seats, and every rotation of a round shares the same
+    dice, so no policy profits from its seat or its luck."""
+    shift = index % numPolicies
+    return [(seat + shift) % numPolicies for seat in range(numPolicies)]
+
+
+def playGame(task):
+    """Plays game index of an evaluation, with the policies seated as seating()
+    gives. task is a (skin, specs, seed, index, maxTurns) tuple. Returns the
+    index in specs of the winning policy, or None, the number of turns played
+    and whether a single player was left. Runs in worker processes."""
+    skin, specs, seed, index, maxTurns = task
+    seats = seating(index, len(specs))
+    providers = [policy.create(specs[i], skin) for i in seats]
+    gameView = runner.playGame(skin, maxTurns=maxTurns, providers=providers,
+                               seed=tournament.gameSeed(seed, index // len(specs)))
+
+    # runner names the player in seat i 'Player i+1'
+    names = ['Player {}'.format(i + 1) for i in range(len(seats))]
+    winner = seats[names.index(gameView.winner)] if gameView.winner else None
+    return winner, gameView.turns, len(gameView.players) == 1
+
+
+def run(skin, specs, games, maxTurns=1000, seed=0, workers=None):
+    """Plays policies against each other, one seat each, across a pool of
+    worker processes. Specs are (name, options) pairs as returned by
+    policy.parseSpec. games is rounded up to a whole number of seat rotations.
+    Returns a dictionary with the wins, win rate and 95% confidence interval of
+    every policy."""
+    workers = workers if workers else os.cpu_count()
+    n = len(specs)
+    games = -(-games // n) * n
+    tasks = ((skin, specs, seed, i, maxTurns) for i in range(games))
+    wins = [0] * n
+    turns = 0
+    finished = 0
+    start = time.perf_counter()
+
+    with runner.workerPool(workers) as pool:
+        for winner, gameTurns, gameFinished in runner.mapGames(pool, playGame, tasks,
+                                                               runner.chunkSize(games, workers)):
+            turns += gameTurns
+            finished += gameFinished
+            if winner is not None:
+                wins[winner] += 1
+
+    data = runner.stats(games, turns, time.perf_counter() - start, wins)
+    data['finished'] = finished
+    data['workers'] = workers
+    data['policies'] = [{
+        'policy': policy.describe(spec),
+        'wins': wins[i],
+        'winRate': wins[i] / games,
+        'interval': wilson(wins[i], games)
+    } for i, spec in enumerate(specs)]
+    return data
+
+
+if __name__ == '__main__':
+    eparser = argparse.ArgumentParser(description="Play AI policies against each other.")
+    eparser.add_argument('policies', nargs='+',
+                         help=("policies to play, one per seat, as name or "
+                               "name:key=value,... ({})".format(', '.join(sorted(policy.POLICIES)))))
+    eparser.add_argument('--skin', default='standard')
+    eparser.add_argument('--games', type=int, default=1000)
+    eparser.add_argument('--max-turns', type=int, default=1000)
+    eparser.add_argument('--seed', type=int, default=0)
+    eparser.add_argument('--workers', type=int, default=0,
+                         help="number of worker processes (0 uses every core)")
+    args = eparser.parse_args()
+
+    try:
+        specs = [policy.parseSpec(text) for text in args.policies]
+    except ValueError as e:
+        eparser.error(str(e))
+
+    stats = run('skin/' + args.skin + '.json', specs, args.games, args.max_turns, args.seed,
+                args.workers)
+    print("Played {} games ({} finished, {} turns) in {:.3f}s on {} workers.".format(
+        stats['games'], stats['finished'], stats['turns'], stats['seconds'], stats['workers']))
+    width = max(len(result['policy']) for result in stats['policies'])
+    for result in stats['policies']:
+        low, high = result['interval']
+        print("{:<{}} {:>6} wins  {:6.1%}  [{:.1%}, {:.1%}]".format(
+            result['policy'], width, result['wins'], result['winRate'], low, high))
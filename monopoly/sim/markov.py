@@ -0,0 +1,118 @@
+################
+# Monopoly/Sim
+# markov.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import os
+
+from engine import board
+from engine import controller
+from engine import dice
+from engine import tile
+
+_cache = {}
+
+
+def transitions(size, outcomes, maxRolls=controller.Move.MAX_ROLLS):
+    """Builds the sparse transition matrix of a single roll. State
+    pos * maxRolls + d means a piece has just landed on pos after d consecutive
+    doubles this turn. Returns one list of (state, probability) pairs per
+    state."""
+    moves = {}
+    for a, b, p in outcomes:
+        key = (a + b, a == b)
+        moves[key] = moves.get(key, 0.0) + p
+
+    rows = []
+    for pos in range(size):
+        for doubles in range(maxRolls):
+            row = {}
+            for (delta, isDouble), p in moves.items():
+                nextDoubles = doubles + 1 if isDouble and doubles < maxRolls - 1 else 0
+                state = ((pos + delta) % size) * maxRolls + nextDoubles
+                row[state] = row.get(state, 0.0) + p
+
+            rows.append(list(row.items()))
+
+    return rows
+
+
+def stationary(rows, tolerance=1e-12, maxIterations=10000):
+    """Returns the stationary distribution of the given transition matrix,
+    found by power iteration."""
+    n = len(rows)
+    dist = [1.0 / n] * n
+    for _ in range(maxIterations):
+        nextDist = [0.0] * n
+        for i, row in enumerate(rows):
+            mass = dist[i]
+            if mass:
+                for j, p in row:
+                    nextDist[j] += mass * p
+
+        delta = max(abs(x - y) for x, y in zip(dist, nextDist))
+        dist = nextDist
+        if delta < tolerance:
+            break
+
+    return dist
+
+
+class LandingModel(object):
+    """Long run landing statistics for a skin, computed from the transition
+    matrix of the dice rather than by simulation."""
+    def __init__(self, skin):
+        gameBoard = board.Board(skin)
+        maxRolls = controller.Move.MAX_ROLLS
+        dist = stationary(transitions(gameBoard.size, dice.Dice.outcomes(), maxRolls))
+
+        self._size = gameBoard.size
+        self._tiles = [gameBoard.getTile(pos) for pos in range(self._size)]
+        self._probabilities = [sum(dist[pos * maxRolls:(pos + 1) * maxRolls])
+                               for pos in range(self._size)]
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def names(self):
+        """Returns the name of each tile, ordered from least to greatest index."""
+        return [t.name for t in self._tiles]
+
+    @property
+    def probabilities(self):
+        """Returns the probability that a roll lands on each tile, ordered from
+        least to greatest index."""
+        return list(self._probabilities)
+
+    def expectedRent(self, level=0):
+        """Returns the rent each tile is expected to collect per roll when
+        every property is owned at the given improvement level."""
+        rents = []
+        for prob, t in zip(self._probabilities, self._tiles):
+            if isinstance(t, tile.Property):
+                table = t.rents
+                rents.append(prob * table[min(level, len(table) - 1)])
+            else:
+                rents.append(0.0)
+
+        return rents
+
+    def expectedRentPerRoll(self, level=0):
+        """Returns the total rent expected to be paid per roll when every
+        property is owned at the given improvement level."""
+        return sum(self.expectedRent(level))
+
+
+def analyse(skin):
+    """Returns the LandingModel for a skin file. Models are cached until the
+    file is modified."""
+    path = os.path.abspath(skin)
+    key = (path, os.stat(path).st_mtime_ns)
+    if key not in _cache:
+        _cache[key] = LandingModel(path)
+
+    return _cache[key]
@@ -0,0 +1,54 @@
+################
+# Monopoly/Sim
+# membench.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import argparse
+import gc
+import tracemalloc
+
+from engine import board
+from engine import controller
+from view import headless
+
+
+def hostGame(skin, numPlayers, turns):
+    """Creates a headless game and plays the given number of turns so that
+    players own some properties."""
+    gameBoard = board.Board(skin)
+    gameView = headless.View(maxTurns=turns)
+    gameController = controller.Controller(gameBoard, gameView, False)
+    gameView.registerController(gameController)
+
+    for i in range(numPlayers):
+        gameView.playerAdd('Player {}'.format(i + 1), 'Piece {}'.format(i + 1))
+
+    gameView.play()
+    return gameController
+
+
+def measure(skin, games=200, numPlayers=4, turns=40):
+    """Returns the average number of bytes held by each hosted game."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    hosted = [hostGame(skin, numPlayers, turns) for _ in range(games)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del hosted
+    return (after - before) / games
+
+
+if __name__ == '__main__':
+    mparser = argparse.ArgumentParser()
+    mparser.add_argument('--skin', help="name of the JSON file to load", default='standard')
+    mparser.add_argument('--games', help="number of games to host", type=int, default=200)
+    mparser.add_argument('--players', help="number of players in each game", type=int, default=4)
+    args = mparser.parse_args()
+
+    perGame = measure('skin/' + args.skin + '.json', args.games, args.players)
+    print("{:.0f} bytes per hosted game.".format(perGame))
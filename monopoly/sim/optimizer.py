@@ -0,0 +1,188 @@
+################
+# Monopoly/Sim
+# optimizer.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import argparse
+import os
+import random
+import time
+
+from . import evaluate
+from . import policy
+from . import runner
+
+# option ranges of the SidePriority policy
+RANGES = {
+    'reserve': (0, 1000),
+    'side0': (0.0, 1.0),
+    'side1': (0.0, 1.0),
+    'side2': (0.0, 1.0),
+    'side3': (0.0, 1.0)
+}
+
+
+class Candidate(object):
+    """A set of SidePriority options and the results of its games so far."""
+    def __init__(self, options):
+        self.options = options
+        self.wins = 0
+        self.games = 0
+
+    @property
+    def spec(self):
+        return 'sides', self.options
+
+    @property
+    def winRate(self):
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def interval(self):
+        return evaluate.wilson(self.wins, self.games)
+
+
+def randomOptions(rng):
+    """Returns options drawn uniformly from RANGES."""
+    options = {}
+    for key, (low, high) in RANGES.items():
+        if isinstance(low, int):
+            options[key] = rng.randint(low, high)
+        else:
+            options[key] = round(rng.uniform(low, high), 2)
+
+    return options
+
+
+def mutate(options, rng, scale=0.15):
+    """Returns a copy of options with every value moved by a gaussian step of
+    scale times the width of its range."""
+    child = {}
+    for key, (low, high) in RANGES.items():
+        value = min(high, max(low, options[key] + rng.gauss(0, scale * (high - low))))
+        child[key] = int(round(value)) if isinstance(low, int) else round(value, 2)
+
+    return child
+
+
+class Optimizer(object):
+    """Evolves SidePriority options by playing candidates against a fixed set
+    of opponents. Every generation races its candidates: games are played in
+    rounds, and only candidates whose win rate interval still overlaps the
+    leader's get another round, so clear losers stop early and close calls get
+    the games they need."""
+    def __init__(self, skin, opponents, population=12, roundGames=40, maxGames=400,
+                 maxTurns=500, seed=0, workers=None):
+        self._skin = skin
+        self._opponents = opponents
+        self._population = population
+        # games per round are a whole number of seat rotations
+        seats = len(opponents) + 1
+        self._roundGames = -(-roundGames // seats) * seats
+        self._maxGames = maxGames
+        self._maxTurns = maxTurns
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._workers = workers if workers else os.cpu_count()
+        self._games = 0
+
+    @property
+    def games(self):
+        """Returns the number of games played so far."""
+        return self._games
+
+    def _play(self, pool, candidates):
+        # every candidate plays the same games, so differences are not luck
+        tasks = []
+        for c, candidate in enumerate(candidates):
+            specs = [candidate.spec] + self._opponents
+            for i in range(candidate.games, candidate.games + self._roundGames):
+                tasks.append((c, (self._skin, specs, self._seed, i, self._maxTurns)))
+
+        for c, winner in runner.mapGames(pool, _playGame, tasks,
+                                         runner.chunkSize(len(tasks), self._workers)):
+            candidates[c].games += 1
+            candidates[c].wins += winner == 0
+
+        self._games += len(tasks)
+
+    def race(self, pool, candidates):
+        """Plays rounds of games until the leader of candidates is clear or every
+        contender has played maxGames. Returns the candidates, best first."""
+        active = candidates
+        while active:
+            self._play(pool, active)
+            leader = max(candidates, key=lambda c: c.winRate)
+            low = leader.interval[0]
+            contenders = [c for c in candidates if c.interval[1] >= low]
+            if len(contenders) <= 1:
+                break
+
+            active = [c for c in contenders if c.games < self._maxGames]
+
+        return sorted(candidates, key=lambda c: c.winRate, reverse=True)
+
+    def run(self, generations, report=None):
+        """Runs the given number of generations and returns the best candidate.
+        The best quarter of each generation survives, with its results, and the
+        rest of the next generation is bred from it by mutation. report is
+        called with the generation number and its ranked candidates."""
+        candidates = [Candidate(randomOptions(self._rng)) for _ in range(self._population)]
+        with runner.workerPool(self._workers) as pool:
+            for generation in range(generations):
+                ranked = self.race(pool, candidates)
+                if report:
+                    report(generation, ranked)
+
+                elite = ranked[:max(1, self._population // 4)]
+                candidates = elite + [Candidate(mutate(self._rng.choice(elite).options, self._rng))
+                                      for _ in range(self._population - len(elite))]
+
+        return ranked[0]
+
+
+def _playGame(task):
+    """Worker entry point. Returns the candidate and the winning seat's policy."""
+    c, gameTask = task
+    winner, _, _ = evaluate.playGame(gameTask)
+    return c, winner
+
+
+def _report(generation, ranked):
+    best = ranked[0]
+    low, high = best.interval
+    print("Generation {}: best {} wins {:.1%} [{:.1%}, {:.1%}] over {} games".format(
+        generation + 1, policy.describe(best.spec), best.winRate, low, high, best.games))
+
+
+if __name__ == '__main__':
+    oparser = argparse.ArgumentParser(description="Tune the options of the sides policy.")
+    oparser.add_argument('--skin', default='standard')
+    oparser.add_argument('--opponents', nargs='+', default=['always', 'threshold', 'roi'],
+                         help="policies played against, as name or name:key=value,...")
+    oparser.add_argument('--generations', type=int, default=5)
+    oparser.add_argument('--population', type=int, default=12)
+    oparser.add_argument('--round-games', type=int, default=40,
+                         help="games a candidate plays per racing round")
+    oparser.add_argument('--max-games', type=int, default=400,
+                         help="games a candidate may play per generation")
+    oparser.add_argument('--max-turns', type=int, default=500)
+    oparser.add_argument('--seed', type=int, default=0)
+    oparser.add_argument('--workers', type=int, default=0,
+                         help="number of worker processes (0 uses every core)")
+    args = oparser.parse_args()
+
+    try:
+        opponents = [policy.parseSpec(text) for text in args.opponents]
+    except ValueError as e:
+        oparser.error(str(e))
+
+    start = time.perf_counter()
+    optimizer = Optimizer('skin/' + args.skin + '.json', opponents, args.population,
+                          args.round_games, args.max_games, args.max_turns, args.seed,
+                          args.workers)
+    best = optimizer.run(args.generations, _report)
+    print("Played {} games in {:.1f}s.".format(optimizer.games, time.perf_counter() - start))
+    print("Best: " + policy.describe(best.spec))
@@ -0,0 +1,129 @@
+################
+# Monopoly/Sim
+# policy.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+from view import headless
+from . import markov
+
+
+class AlwaysBuy(headless.DecisionProvider):
+    """Buys every property it can afford and mortgages properties in the order
+    they were bought."""
+    def __init__(self, skin=None):
+        pass
+
+
+class CashThreshold(headless.DecisionProvider):
+    """Buys a property only if at least reserve cash is left afterwards.
+    Mortgages the cheapest properties first."""
+    def __init__(self, skin=None, reserve=200):
+        self._reserve = reserve
+
+    def buy(self, player, tile):
+        return player['cash'] - tile['value'] >= self._reserve
+
+    def liquidate(self, player, required, properties):
+        return [prop['name'] for prop in sorted(properties, key=lambda prop: prop['value'])]
+
+
+class ROI(headless.DecisionProvider):
+    """Buys a property if the rent it is expected to collect from opponents
+    within horizon turns, according to the landing model of the skin, makes up
+    for what buying costs in net worth: its price less the mortgage value the
+    player keeps. Mortgages the properties that earn the least per dollar of
+    mortgage value first."""
+    def __init__(self, skin, horizon=100, reserve=0, opponents=3):
+        model = markov.analyse(skin)
+        self._horizon = horizon
+        self._reserve = reserve
+        # rent each tile is expected to collect per turn from all opponents
+        self._income = {}
+        for name, rent in zip(model.names, model.expectedRent()):
+            self._income[name] = max(self._income.get(name, 0.0), rent * opponents)
+
+    def buy(self, player, tile):
+        if player['cash'] - tile['value'] < self._reserve:
+            return False
+
+        cost = tile['value'] - tile['value'] // 2
+        return cost <= self._income.get(tile['name'], 0.0) * self._horizon
+
+    def liquidate(self, player, required, properties):
+        ranked = sorted(properties,
+                        key=lambda prop: self._income.get(prop['name'], 0.0) / (prop['value'] or 1))
+        return [prop['name'] for prop in ranked]
+
+
+class SidePriority(headless.DecisionProvider):
+    """Groups properties by the side of the board they are on, since skins do
+    not define colour groups. Each side has a priority between 0 and 1: a
+    property is bought if at least reserve * (1 - priority) cash is left
+    afterwards, and properties on the sides with the lowest priority are
+    mortgaged first. Options are reserve and side0 to side3."""
+    SIDES = 4
+
+    def __init__(self, skin, reserve=200, side0=0.5, side1=0.5, side2=0.5, side3=0.5):
+        model = markov.analyse(skin)
+        self._reserve = reserve
+        self._priorities = (side0, side1, side2, side3)
+        self._sideLength = -(-model.size // self.SIDES)
+        self._positions = {}
+        for pos, name in enumerate(model.names):
+            self._positions.setdefault(name, pos)
+
+    def priority(self, name):
+        """Returns the priority of the named tile."""
+        return self._priorities[self._positions.get(name, 0) // self._sideLength]
+
+    def buy(self, player, tile):
+        return player['cash'] - tile['value'] >= self._reserve * (1 - self.priority(tile['name']))
+
+    def liquidate(self, player, required, properties):
+        ranked = sorted(properties, key=lambda prop: (self.priority(prop['name']), prop['value']))
+        return [prop['name'] for prop in ranked]
+
+
+# policies by the name used to select them
+POLICIES = {
+    'always': AlwaysBuy,
+    'threshold': CashThreshold,
+    'roi': ROI,
+    'sides': SidePriority
+}
+
+
+def parseSpec(text):
+    """Parses a policy given as name:key=value,key=value into a (name, options)
+    spec. Raises ValueError for unknown policies or malformed options."""
+    name, _, rest = text.partition(':')
+    if name not in POLICIES:
+        raise ValueError("Unknown policy: " + name)
+
+    options = {}
+    for item in filter(None, rest.split(',')):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError("Invalid policy option: " + item)
+
+        options[key] = float(value) if '.' in value else int(value)
+
+    return name, options
+
+
+def create(spec, skin):
+    """Creates the policy described by a (name, options) spec for the given
+    skin."""
+    name, options = spec
+    return POLICIES[name](skin, **options)
+
+
+def describe(spec):
+    """Returns a spec formatted the way parseSpec reads it."""
+    name, options = spec
+    if not options:
+        return name
+
+    return name + ':' + ','.join('{}={}'.format(k, v) for k, v in sorted(options.items()))
@@ -0,0 +1,363 @@
+################
+# Monopoly/Sim
+# results.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import argparse
+import array
+import ast
+import math
+import os
+import sys
+import time
+
+from . import runner
+from . import tournament
+
+NPY_MAGIC = b'\x93NUMPY'
+# numpy dtype of each array typecode used for columns
+_DTYPES = {'b': '|i1', 'B': '|u1', 'h': '<i2', 'H': '<u2', 'i': '<i4', 'q': '<i8', 'd': '<f8'}
+_TYPECODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+
+def writeNpy(path, values):
+    """Writes an array.array to a version 1.0 .npy file that numpy.load can
+    read."""
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}".format(
+        _DTYPES[values.typecode], len(values))
+    # magic, version and header length take 10 bytes; pad the total to 64
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = (header + ' ' * padding + '\n').encode('latin1')
+
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(NPY_MAGIC + b'\x01\x00' + len(header).to_bytes(2, 'little'))
+        f.write(header)
+        values.tofile(f)
+
+
+def readNpy(path):
+    """Reads a one dimensional .npy file written by writeNpy into an
+    array.array. Raises ValueError for other files."""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if data[:6] != NPY_MAGIC or data[6] != 1:
+        raise ValueError("Not a version 1.0 .npy file: " + path)
+
+    length = int.from_bytes(data[8:10], 'little')
+    header = ast.literal_eval(data[10:10 + length].decode('latin1'))
+    if header['descr'] not in _TYPECODES or header['fortran_order'] or len(header['shape']) != 1:
+        raise ValueError("Unsupported .npy array: " + path)
+
+    values = array.array(_TYPECODES[header['descr']])
+    values.frombytes(data[10 + length:])
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values.byteswap()
+
+    return values
+
+
+class Welford(object):
+    """Running count, mean, variance, minimum and maximum of a stream of
+    numbers, in constant memory."""
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    @property
+    def variance(self):
+        """Returns the sample variance."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+
+class P2Quantile(object):
+    """Running estimate of a quantile of a stream of numbers, in constant
+    memory, using the P-square algorithm of Jain and Chlamtac."""
+    __slots__ = ('_q', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, q):
+        self._q = q
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    @property
+    def value(self):
+        """Returns the current estimate, or None if nothing has been added."""
+        h = self._heights
+        if len(h) < 5 or self._positions[4] < 5:
+            if not h:
+                return None
+            ordered = sorted(h)
+            return ordered[int(round(self._q * (len(ordered) - 1)))]
+
+        return h[2]
+
+    def add(self, x):
+        h = self._heights
+        n = self._positions
+        if len(h) < 5:
+            h.append(x)
+            if len(h) == 5:
+                h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = h[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+                if not h[i - 1] < height < h[i + 1]:
+                    height = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = height
+                n[i] += d
+
+
+class OnlineStats(object):
+    """Mean, variance, extremes and quantiles of a stream of numbers."""
+    def __init__(self, quantiles=(0.5, 0.9, 0.99)):
+        self._moments = Welford()
+        self._quantiles = [P2Quantile(q) for q in quantiles]
+        self._names = ['p{:g}'.format(q * 100) for q in quantiles]
+
+    def add(self, x):
+        self._moments.add(x)
+        for quantile in self._quantiles:
+            quantile.add(x)
+
+    def snapshot(self):
+        """Returns the statistics as a dictionary."""
+        moments = self._moments
+        data = {
+            'count': moments.count,
+            'mean': moments.mean,
+            'stdev': moments.stdev,
+            'min': moments.min,
+            'max': moments.max
+        }
+        for name, quantile in zip(self._names, self._quantiles):
+            data[name] = quantile.value
+
+        return data
+
+
+class ResultSink(object):
+    """Streams game summaries into chunked columnar .npy files. Every chunk of
+    chunkSize games is written as one file per column, named
+    <column>-<chunk>.npy, so memory use does not grow with the number of games.
+    Per seat columns are named cash0, tiles0, rent0 and so on. Keeps online
+    statistics of every game added."""
+    def __init__(self, directory, numPlayers, chunkSize=65536):
+        self._directory = directory
+        self._chunkSize = chunkSize
+        self._chunks = 0
+        self._columns = {'game': array.array('q'), 'winner': array.array('b'),
+                         'turns': array.array('i'), 'finished': array.array('B')}
+        for seat in range(numPlayers):
+            self._columns['cash{}'.format(seat)] = array.array('q')
+            self._columns['tiles{}'.format(seat)] = array.array('H')
+            self._columns['rent{}'.format(seat)] = array.array('q')
+
+        self._wins = [0] * numPlayers
+        self._stats = {name: OnlineStats() for name in ('turns', 'cash', 'tiles', 'rent')}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def chunks(self):
+        """Returns the number of chunks written so far."""
+        return self._chunks
+
+    def add(self, summary):
+        """Adds the summary of a game: a dictionary with the game index, the
+        winning seat (-1 for none), the number of turns, whether the game
+        finished and per seat lists of final cash, tiles owned and rent
+        collected."""
+        columns = self._columns
+        columns['game'].append(summary['game'])
+        columns['winner'].append(summary['winner'])
+        columns['turns'].append(summary['turns'])
+        columns['finished'].append(summary['finished'])
+        self._stats['turns'].add(summary['turns'])
+        if summary['winner'] >= 0:
+            self._wins[summary['winner']] += 1
+
+        for key in ('cash', 'tiles', 'rent'):
+            stats = self._stats[key]
+            for seat, value in enumerate(summary[key]):
+                columns[key + str(seat)].append(value)
+                stats.add(value)
+
+        if len(columns['game']) >= self._chunkSize:
+            self.flush()
+
+    def flush(self):
+        """Writes the games added since the last chunk as a new chunk."""
+        if not self._columns['game']:
+            return
+
+        for name, values in self._columns.items():
+            path = os.path.join(self._directory, '{}-{:06d}.npy'.format(name, self._chunks))
+            writeNpy(path, values)
+            del values[:]
+
+        self._chunks += 1
+
+    def close(self):
+        self.flush()
+
+    def snapshot(self):
+        """Returns the win count of each seat and the statistics of turns, final
+        cash, tiles owned and rent collected per player."""
+        data = {name: stats.snapshot() for name, stats in self._stats.items()}
+        data['wins'] = list(self._wins)
+        return data
+
+
+def readColumn(directory, name):
+    """Yields the chunks of a column in order, each as an array.array."""
+    chunk = 0
+    while True:
+        path = os.path.join(directory, '{}-{:06d}.npy'.format(name, chunk))
+        if not os.path.exists(path):
+            return
+
+        yield readNpy(path)
+        chunk += 1
+
+
+def summarize(gameView, index, numPlayers):
+    """Returns the summary of a finished headless game played by
+    runner.playGame."""
+    names = ['Player {}'.format(i + 1) for i in range(numPlayers)]
+    players = {player['name']: player for player in gameView.controller.queryPlayers()}
+    rent = gameView.rentCollected
+    return {
+        'game': index,
+        'winner': names.index(gameView.winner) if gameView.winner else -1,
+        'turns': gameView.turns,
+        'finished': len(players) == 1,
+        'cash': [players[name]['cash'] if name in players else 0 for name in names],
+        'tiles': [len(players[name]['properties']) if name in players else 0 for name in names],
+        'rent': [rent.get(name, 0) for name in names]
+    }
+
+
+def _playGame(task):
+    """Worker entry point. Only the game summary is sent back to the parent."""
+    skin, seed, index, numPlayers, maxTurns = task
+    gameView = runner.playGame(skin, numPlayers, maxTurns, seed=tournament.gameSeed(seed, index))
+    return summarize(gameView, index, numPlayers)
+
+
+def run(skin, games, directory, numPlayers=4, maxTurns=1000, seed=0, workers=None,
+        chunkSize=65536, report=None, every=10000):
+    """Plays seeded headless games across a pool of worker processes and
+    streams their summaries into a ResultSink in the given directory. Tasks
+    are handed to the pool in blocks, so memory use stays flat however many
+    games are played. report, if given, is called with the statistics of the
+    sink every few games. Returns the final statistics of the sink."""
+    workers = workers if workers else os.cpu_count()
+    sink = ResultSink(directory, numPlayers, chunkSize)
+    chunksize = min(256, runner.chunkSize(games, workers))
+    block = chunksize * workers * 16
+
+    try:
+        with runner.workerPool(workers) as pool:
+            done = 0
+            for start in range(0, games, block):
+                tasks = [(skin, seed, i, numPlayers, maxTurns)
+                         for i in range(start, min(games, start + block))]
+                for summary in runner.mapGames(pool, _playGame, tasks, chunksize):
+                    sink.add(summary)
+                    done += 1
+                    if report and done % every == 0:
+                        report(sink.snapshot())
+    finally:
+        sink.close()
+
+    return sink.snapshot()
+
+
+def _report(data):
+    turns = data['turns']
+    rent = data['rent']
+    # the quantiles are None until a game has been added
+    if not turns['count']:
+        print("0 games.")
+        return
+
+    print("{} games: turns mean {:.1f} p50 {:.0f} p99 {:.0f}; rent per player mean {:.0f} "
+          "p90 {:.0f}; wins {}".format(turns['count'], turns['mean'], turns['p50'],
+                                      turns['p99'], rent['mean'], rent['p90'], data['wins']))
+
+
+if __name__ == '__main__':
+    rparser = argparse.ArgumentParser(description="Stream headless game results to disk.")
+    rparser.add_argument('out', help="directory that receives the .npy chunks")
+    rparser.add_argument('--skin', default='standard')
+    rparser.add_argument('--games', type=int, default=100000)
+    rparser.add_argument('--players', type=int, default=4)
+    rparser.add_argument('--max-turns', type=int, default=1000)
+    rparser.add_argument('--seed', type=int, default=0)
+    rparser.add_argument('--workers', type=int, default=0,
+                         help="number of worker processes (0 uses every core)")
+    rparser.add_argument('--chunk-size', type=int, default=65536,
+                         help="games per .npy chunk")
+    rparser.add_argument('--every', type=int, default=10000,
+                         help="games between progress reports")
+    args = rparser.parse_args()
+
+    start = time.perf_counter()
+    data = run('skin/' + args.skin + '.json', args.games, args.out, args.players,
+               args.max_turns, args.seed, args.workers, args.chunk_size, _report, args.every)
+    _report(data)
+    print("Done in {:.1f}s.".format(time.perf_counter() - start))
@@ -0,0 +1,97 @@
+################
+# Monopoly/Sim
+# runner.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import contextlib
+import multiprocessing
+import random
+import time
+
+from engine import board
+from engine import controller
+from engine import dice
+from view import headless
+
+
+def playGame(skin, numPlayers=4, maxTurns=1000, provider=None, seed=None, gameDice=None,
+             gameProfiler=None, providers=None):
+    """Plays a single headless game to completion. Returns the finished view,
+    which holds the winner and the number of turns played. Games given the
+    same seed roll the same dice. If a list of providers is given, player i
+    uses providers[i] and numPlayers is ignored."""
+    if gameDice is None and seed is not None:
+        gameDice = dice.TapeDice(random.Random(seed))
+    gameBoard = board.Board(skin, gameDice)
+    gameView = headless.View(provider, maxTurns)
+    gameController = controller.Controller(gameBoard, gameView, False,
+                                           gameProfiler=gameProfiler)
+    gameView.registerController(gameController)
+
+    if providers is None:
+        providers = [None] * numPlayers
+    for i, playerProvider in enumerate(providers):
+        gameView.playerAdd('Player {}'.format(i + 1), 'Piece {}'.format(i + 1), playerProvider)
+
+    gameView.play()
+    return gameView
+
+
+@contextlib.contextmanager
+def workerPool(workers):
+    """Context manager that yields a pool of the given number of worker
+    processes, or None if a single worker is asked for so that games are
+    played in this process. The pool is closed and joined on exit."""
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        yield pool
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+
+def chunkSize(tasks, workers):
+    """Returns how many tasks to hand a worker at a time, so that every worker
+    gets about four chunks."""
+    return max(1, tasks // (workers * 4))
+
+
+def mapGames(pool, playTask, tasks, chunksize=1):
+    """Calls playTask, a module level function, on every task in the pool
+    returned by workerPool. Returns an iterator over the results, in the order
+    they finish."""
+    if pool:
+        return pool.imap_unordered(playTask, tasks, chunksize)
+    return map(playTask, tasks)
+
+
+def stats(games, turns, elapsed, wins):
+    """Returns the throughput statistics of a run that played the given number
+    of games and turns in elapsed seconds."""
+    return {
+        'games': games,
+        'turns': turns,
+        'seconds': elapsed,
+        'gamesPerSec': games / elapsed if elapsed else 0.0,
+        'turnsPerSec': turns / elapsed if elapsed else 0.0,
+        'wins': wins
+    }
+
+
+def run(skin, games, numPlayers=4, maxTurns=1000, gameProfiler=None):
+    """Plays the given number of headless games back to back. Returns a
+    dictionary of throughput statistics for the run. Every game is recorded
+    in the given profiler."""
+    wins = {}
+    turns = 0
+    start = time.perf_counter()
+
+    for _ in range(games):
+        gameView = playGame(skin, numPlayers, maxTurns, gameProfiler=gameProfiler)
+        turns += gameView.turns
+        wins[gameView.winner] = wins.get(gameView.winner, 0) + 1
+
+    return stats(games, turns, time.perf_counter() - start, wins)
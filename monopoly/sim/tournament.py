@@ -0,0 +1,46 @@
+################
+# Monopoly/Sim
+# tournament.py
+# 2026-10-18
+# Kelvin Wu
+################
+
+import os
+import time
+
+from . import runner
+
+
+def gameSeed(seed, index):
+    """Returns the seed for game index of a tournament, given the integer seed
+    of the run. Each game gets its own stream, so results do not depend on how
+    games are spread across workers."""
+    return '{}:{}'.format(seed, index)
+
+
+def _playGame(task):
+    """Worker entry point. Only the game summary is sent back to the parent."""
+    skin, seed, index, numPlayers, maxTurns = task
+    gameView = runner.playGame(skin, numPlayers, maxTurns, seed=gameSeed(seed, index))
+    return index, gameView.winner, gameView.turns
+
+
+def run(skin, games, numPlayers=4, maxTurns=1000, seed=0, workers=None):
+    """Plays the given number of seeded headless games across a pool of worker
+    processes. Uses every core if workers is not given. Returns a dictionary of
+    throughput statistics for the run."""
+    workers = workers if workers else os.cpu_count()
+    tasks = ((skin, seed, i, numPlayers, maxTurns) for i in range(games))
+    wins = {}
+    turns = 0
+    start = time.perf_counter()
+
+    with runner.workerPool(workers) as pool:
+        for _, winner, gameTurns in runner.mapGames(pool, _playGame, tasks,
+                                                    runner.chunkSize(games, workers)):
+            turns += gameTurns
+            wins[winner] = wins.get(winner, 0) + 1
+
+    data = runner.stats(games, turns, time.perf_counter() - start, wins)
+    data['workers'] = workers
+    return data
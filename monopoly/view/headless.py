@@ -0,0 +1,191 @@
+###############
+# Monopoly/View
+# headless.py
+# 2026-10-18
+# Kelvin Wu
+###############
+
+from . import view
+
+
+class DecisionProvider(object):
+    """Answers the decisions that an interactive view would ask a human player
+    to make. Receives player and tile data structured according to pack()."""
+    def buy(self, player, tile):
+        """Returns true if player should purchase the tile they landed on."""
+        return tile['value'] <= player['cash']
+
+    def liquidate(self, player, required, properties):
+        """Returns the names of the properties player should mortgage, in
+        order, to raise the required amount. Mortgaging stops as soon as the
+        debt is paid off."""
+        return [prop['name'] for prop in properties]
+
+    def rollAgain(self, player):
+        """Returns true if player should take the extra roll earned by rolling
+        doubles rather than end their turn."""
+        return True
+
+
+class View(view.MonopolyView):
+    """View that plays a full game without any user input. Every decision is
+    delegated to a DecisionProvider, either the one given to a player when it
+    was added or the default provider."""
+    def __init__(self, provider=None, maxTurns=1000):
+        super().__init__()
+        self._provider = provider if provider else DecisionProvider()
+        self._maxTurns = maxTurns
+        self._players = []
+        self._providers = {}
+        self._states = {}
+        self._cash = {}
+        self._rent = {}
+        self._mortgaged = set()
+        self._debts = {}
+        self._rollAgain = False
+        self._turns = 0
+
+    @property
+    def controller(self):
+        return self._controller
+
+    @property
+    def players(self):
+        return self._players
+
+    @property
+    def rentCollected(self):
+        """Returns the total rent collected by each player added to the game,
+        including players that went bankrupt."""
+        return self._rent
+
+    @property
+    def turns(self):
+        return self._turns
+
+    @property
+    def winner(self):
+        """Returns the last player standing, or the player with the highest net
+        worth if the game was stopped after the maximum number of turns."""
+        players = self._controller.queryPlayers()
+        if not players:
+            return None
+
+        return max(players, key=self.netWorth)['name']
+
+    def netWorth(self, player):
+        """Returns the cash of a player plus what their unmortgaged properties
+        would raise if mortgaged, as sim.advisor.netWorth does. Takes player
+        data structured according to pack()."""
+        return player['cash'] + sum(prop['value'] // 2 for prop in player['properties']
+                                    if prop['name'] not in self._mortgaged)
+
+    def playerAdd(self, name, piece, provider=None):
+        self._players.append(name)
+        self._providers[name] = provider if provider else self._provider
+        self._rent[name] = 0
+        self._cash[name] = self._controller.queryCurrency()['defaultAmount']
+        self._controller.playerAdd(name, piece)
+
+    def resume(self):
+        """Takes over a game that is already in progress, such as a forked
+        game. Players keep the providers they were given, if any."""
+        players = self._controller.queryPlayers()
+        self._players = [player['name'] for player in players]
+        self._providers = {name: self._providers.get(name, self._provider)
+                           for name in self._players}
+        self._states = {player['name']: player for player in players}
+        self._cash = {player['name']: player['cash'] for player in players}
+        self._mortgaged = {tile['name'] for tile in self._controller.queryTiles()
+                           if tile.get('mortgaged')}
+        self._debts = {}
+
+    def playerBankrupt(self, player, other, properties):
+        """Takes a player out of the game. Hands over assets to other."""
+        self._controller.playerBankrupt(player, other)
+        self._debts.pop(player, None)
+        self._players.remove(player)
+
+        if other in self._cash:
+            self._cash[other] += self._cash[player]
+        else:
+            self._mortgaged.difference_update(prop['name'] for prop in properties)
+
+        del self._cash[player]
+        self._states.pop(player, None)
+
+    def _update(self, *players):
+        for player in players:
+            if player['name'] in self._cash:
+                self._cash[player['name']] = player['cash']
+                self._states[player['name']] = player
+
+    def notifyOutOfMoves(self, data):
+        self._rollAgain = False
+
+    def notifyDiceRoll(self, data):
+        self._rollAgain = data['rollAgain']
+
+    def notifyBuyOpp(self, data):
+        if self._providers[data['player']['name']].buy(data['player'], data['tile']):
+            self._controller.playerPurchase(data['player']['name'])
+
+    def notifyPassGo(self, data):
+        self._update(data['player'])
+
+    def notifyTilePurchase(self, data):
+        self._update(data['player'])
+
+    def notifyInsufficientFunds(self, data):
+        pass
+
+    def notifyLiquidate(self, data):
+        player = data['player']
+        self._debts[player['name']] = data['required']
+        properties = [prop for prop in player['properties']
+                      if prop['name'] not in self._mortgaged]
+
+        provider = self._providers[player['name']]
+        for tile in provider.liquidate(player, data['required'], properties):
+            if player['name'] not in self._debts:
+                break
+
+            self._controller.playerMortgage(player['name'], tile)
+
+        if player['name'] in self._debts:
+            self.playerBankrupt(player['name'], data['other']['name'],
+                                player['properties'])
+
+    def notifyPlayerMove(self, data):
+        self._update(data['player'])
+
+    def notifyRentPaid(self, data):
+        self._debts.pop(data['playerRenter']['name'], None)
+        landlord = data['playerLandlord']['name']
+        self._rent[landlord] = self._rent.get(landlord, 0) + data['rent']
+        self._update(data['playerRenter'], data['playerLandlord'])
+
+    def notifyMortgage(self, data):
+        self._mortgaged.add(data['tile']['name'])
+        self._update(data['player'])
+
+    def notifyNotOwned(self, data):
+        pass
+
+    def play(self, turn=0):
+        """Plays turns, starting with the player at the given index, until a
+        single player remains or the maximum number of turns is reached."""
+        while len(self._players) > 1 and self._turns < self._maxTurns:
+            player = self._players[turn]
+            self._controller.playerMove(player)
+            while (self._rollAgain and player in self._cash and
+                   self._providers[player].rollAgain(self._states[player])):
+                self._controller.playerMove(player)
+
+            self._controller.resetCommandState()
+            self._turns += 1
+
+            if player in self._cash:
+                turn = (turn + 1) % len(self._players)
+            else:
+                turn %= len(self._players)
@@ -0,0 +1,70 @@
+###############
+# Monopoly/View
+# remote.py
+# 2026-10-18
+# Kelvin Wu
+###############
+
+from . import view
+
+
+class View(view.MonopolyView):
+    """View for a game driven by an outside client, such as a network client
+    or a host thread. Never waits for a decision: every notification is queued
+    and handed back with the result of the command that caused it, and the
+    client answers with further commands."""
+    def __init__(self):
+        super().__init__()
+        self._outbox = []
+
+    def drain(self):
+        """Returns and clears the queued notifications."""
+        events = self._outbox
+        self._outbox = []
+        return events
+
+    def _push(self, code, data):
+        self._outbox.append({'code': code, 'data': data})
+
+    def notifyDelta(self, code, data):
+        # the client runs its own DeltaDecoder
+        self._push(code, data)
+
+    def notifyBatch(self, events):
+        self._outbox.extend({'code': code, 'data': data} for code, data in events)
+
+    def notifyDeltaBatch(self, events):
+        self.notifyBatch(events)
+
+    def notifyOutOfMoves(self, data):
+        self._push('OUT_OF_MOVES', data)
+
+    def notifyDiceRoll(self, data):
+        self._push('DICE_ROLL', data)
+
+    def notifyBuyOpp(self, data):
+        self._push('BUY_OPP', data)
+
+    def notifyPassGo(self, data):
+        self._push('PASS_GO', data)
+
+    def notifyTilePurchase(self, data):
+        self._push('TILE_PURCHASE', data)
+
+    def notifyInsufficientFunds(self, data):
+        self._push('INSUFFICIENT_FUNDS', data)
+
+    def notifyLiquidate(self, data):
+        self._push('LIQUIDATE', data)
+
+    def notifyPlayerMove(self, data):
+        self._push('PLAYER_MOVE', data)
+
+    def notifyRentPaid(self, data):
+        self._push('RENT_PAID', data)
+
+    def notifyMortgage(self, data):
+        self._push('MORTGAGE', data)
+
+    def notifyNotOwned(self, data):
+        self._push('NOT_OWNED', data)
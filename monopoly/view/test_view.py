@@ -0,0 +1,177 @@
+###############
+# Monopoly/View
+# test_view.py
+# 2026-10-18
+# Kelvin Wu
+###############
+
+import io
+import json
+import os
+import random
+
+from engine import board
+from engine import controller
+from engine import dice
+from view import headless
+from view import textview_min
+from view import view
+
+SKIN = os.path.join(os.path.dirname(__file__), '..', 'skin', 'standard.json')
+
+
+class MirroredView(headless.View):
+    """Headless view that keeps a state mirror and records every notification
+    it receives, with its full data."""
+    def __init__(self, maxTurns):
+        super().__init__(maxTurns=maxTurns)
+        self.attachMirror(view.StateMirror())
+        self.events = []
+
+    def notifyOutOfMoves(self, data):
+        self.events.append(('OUT_OF_MOVES', data))
+        super().notifyOutOfMoves(data)
+
+    def notifyDiceRoll(self, data):
+        self.events.append(('DICE_ROLL', data))
+        super().notifyDiceRoll(data)
+
+    def notifyBuyOpp(self, data):
+        self.events.append(('BUY_OPP', data))
+        super().notifyBuyOpp(data)
+
+    def notifyPassGo(self, data):
+        self.events.append(('PASS_GO', data))
+        super().notifyPassGo(data)
+
+    def notifyTilePurchase(self, data):
+        self.events.append(('TILE_PURCHASE', data))
+        super().notifyTilePurchase(data)
+
+    def notifyInsufficientFunds(self, data):
+        self.events.append(('INSUFFICIENT_FUNDS', data))
+        super().notifyInsufficientFunds(data)
+
+    def notifyLiquidate(self, data):
+        self.events.append(('LIQUIDATE', data))
+        super().notifyLiquidate(data)
+
+    def notifyPlayerMove(self, data):
+        self.events.append(('PLAYER_MOVE', data))
+        super().notifyPlayerMove(data)
+
+    def notifyRentPaid(self, data):
+        self.events.append(('RENT_PAID', data))
+        super().notifyRentPaid(data)
+
+    def notifyMortgage(self, data):
+        self.events.append(('MORTGAGE', data))
+        super().notifyMortgage(data)
+
+    def notifyNotOwned(self, data):
+        self.events.append(('NOT_OWNED', data))
+        super().notifyNotOwned(data)
+
+
+def costlySkin(directory):
+    """Writes a copy of the standard skin with 20 times the rent into the given
+    directory, so that players go into debt and bankrupt. Returns its path."""
+    with open(SKIN) as f:
+        data = json.load(f)
+    for t in data['tiles']:
+        if t['type'] == 'property':
+            t['data']['rent'] = [rent * 20 for rent in t['data']['rent']]
+
+    path = os.path.join(directory, 'costly.json')
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return path
+
+
+def playGame(seed, deltaMode=False, queued=False, maxTurns=300, skin=SKIN):
+    gameBoard = board.Board(skin, dice.TapeDice(random.Random(seed)))
+    gameView = MirroredView(maxTurns)
+    gameController = controller.Controller(gameBoard, gameView, False, deltaMode, queued=queued)
+    gameView.registerController(gameController)
+    for i in range(4):
+        gameView.playerAdd('Player {}'.format(i + 1), 'Piece {}'.format(i + 1))
+    gameView.play()
+    return gameView
+
+
+def test_mirror_updates():
+    mirror = view.StateMirror()
+    tiles = [{'name': 'Go', 'pos': 0}, {'name': 'Park', 'pos': 1, 'owner': None},
+             {'name': 'Place', 'pos': 2, 'owner': 'Ann'}]
+    ann = {'name': 'Ann', 'cash': 100, 'properties': [{'name': 'Place', 'value': 50}]}
+    mirror.load([ann], tiles)
+    assert [t['name'] for t in mirror.owned('Ann')] == ['Place']
+    assert mirror.tileByName('Park')['pos'] == 1
+
+    # full data replaces the state, partial data is merged into it
+    mirror.updatePlayer({'name': 'Ann', 'cash': 90, 'properties': []})
+    assert mirror.player('Ann') == {'name': 'Ann', 'cash': 90, 'properties': []}
+    mirror.mergePlayer({'name': 'Ann', 'cash': 80})
+    assert mirror.player('Ann') == {'name': 'Ann', 'cash': 80, 'properties': []}
+
+    mirror.updateTile({'name': 'Park', 'pos': 1, 'owner': 'Ann'})
+    mirror.updateTile({'name': 'Place', 'pos': 2, 'owner': None})
+    assert [t['name'] for t in mirror.owned('Ann')] == ['Park']
+
+    mirror.removePlayer('Ann')
+    assert mirror.player('Ann') is None and mirror.players == []
+
+
+def test_modes_match_direct(tmp_path):
+    """Delta and queued games send the same notifications, and leave the same
+    state and mirror, as a game in direct mode."""
+    skin = costlySkin(str(tmp_path))
+    direct = playGame(1, skin=skin)
+    for deltaMode, queued in ((True, False), (False, True), (True, True)):
+        gameView = playGame(1, deltaMode, queued, skin=skin)
+        assert gameView.events == direct.events
+        assert gameView.controller.queryPlayers() == direct.controller.queryPlayers()
+        assert gameView.controller.queryTiles() == direct.controller.queryTiles()
+        assert gameView.mirror.players == direct.mirror.players
+        assert gameView.mirror.tiles == direct.mirror.tiles
+
+
+def test_mirror_matches_game(tmp_path):
+    gameView = playGame(2, skin=costlySkin(str(tmp_path)))
+    assert gameView.mirror.players == [dict(pl) for pl in gameView.controller.queryPlayers()]
+    assert gameView.mirror.tiles == [dict(t) for t in gameView.controller.queryTiles()]
+
+
+def test_attach_mirror_after_register():
+    gameView = playGame(3, maxTurns=50)
+    mirror = view.StateMirror()
+    gameView.attachMirror(mirror)
+    assert mirror.players == [dict(pl) for pl in gameView.controller.queryPlayers()]
+
+
+def newTextGame(turn):
+    """Returns a text view of a game between Ann, Bob and Cy where it is the
+    turn of the player at the given index."""
+    gameView = textview_min.View(io.StringIO(), quiet=True)
+    gameController = controller.Controller(board.Board(SKIN), gameView, False)
+    gameView.registerController(gameController)
+    for name in ('Ann', 'Bob', 'Cy'):
+        gameView.playerAdd(name, 'Piece')
+    gameView.numPlayers = 3
+    gameView._inputHandler.turn = turn
+    return gameView, gameView._inputHandler
+
+
+def test_textview_bankrupt_current_player():
+    gameView, handler = newTextGame(2)
+    gameView.playerBankrupt('Cy', None)
+    handler.do_next('')
+    assert gameView.playerAt(handler.turn)['name'] == 'Ann'
+
+
+def test_textview_bankrupt_earlier_player():
+    gameView, handler = newTextGame(2)
+    gameView.playerBankrupt('Ann', None)
+    assert gameView.playerAt(handler.turn)['name'] == 'Cy'
+    handler.do_next('')
+    assert gameView.playerAt(handler.turn)['name'] == 'Bob'
@@ -6,49 +6,134 @@
 ###############
 
 import cmd
+import io
+import sys
 
 from . import view
 
 
-class PlayerRep(object):
-    def __init__(self, name, piece, pos, cash, properties=None):
-        self.name = name
-        self.piece = piece
-        self.pos = pos
-        self.cash = cash
-        self.properties = properties if properties else []
+class BoardMap(object):
+    """Text rendering of the whole board, one row per tile. Keeps an index of
+    the players on each tile and a cache of rendered rows. Rows are rendered
+    again only after they have been marked as changed. Reads tile state from
+    the given StateMirror."""
+    def __init__(self, mirror, currency):
+        self._mirror = mirror
+        self._size = len(mirror.tiles)
+        self._symbol = currency['symbol']
+        self._width = max(len(tile['name']) for tile in mirror.tiles) + 1
+        # names of the players on each tile, in order of arrival
+        self._occupants = [[] for _ in range(self._size)]
+        self._positions = {}
+        self._rows = [None] * self._size
+        # rows changed since they were last shown
+        self._changed = set(range(self._size))
+
+    def occupants(self, pos):
+        """Returns the names of the players on the tile at pos."""
+        return self._occupants[pos]
+
+    def place(self, player, pos):
+        """Moves player to the tile at pos, adding them if they are new."""
+        old = self._positions.get(player)
+        if old == pos:
+            return
+        elif old is not None:
+            self._occupants[old].remove(player)
+            self.touch(old)
+
+        self._positions[player] = pos
+        self._occupants[pos].append(player)
+        self.touch(pos)
+
+    def remove(self, player):
+        """Takes player off the board."""
+        pos = self._positions.pop(player, None)
+        if pos is not None:
+            self._occupants[pos].remove(player)
+            self.touch(pos)
+
+    def touch(self, pos):
+        """Marks the row of the tile at pos as changed."""
+        self._rows[pos] = None
+        self._changed.add(pos)
+
+    def row(self, pos):
+        """Returns the rendered row of the tile at pos."""
+        if self._rows[pos] is None:
+            tile = self._mirror.tile(pos)
+            if tile.get('owner'):
+                status = tile['owner'] + (" (mortgaged)" if tile['mortgaged'] else "")
+            elif 'value' in tile:
+                status = "for sale, {}{}".format(self._symbol, tile['value'])
+            else:
+                status = ""
+
+            row = "{:02} {:{}} {:24} {}".format(pos, tile['name'], self._width, status,
+                                                ", ".join(self._occupants[pos]))
+            self._rows[pos] = row.rstrip() + "\n"
+
+        return self._rows[pos]
+
+    def header(self):
+        return "{:2} {:{}} {:24} Players\n== {:{}} {:24} {}\n".format(
+            "ID", "Location", self._width, "Owner", "=" * len("Location"), self._width,
+            "=" * len("Owner"), "=" * len("Players"))
+
+    def render(self, positions=None):
+        """Returns a frame holding the header and the rows of the given
+        positions, or of every tile."""
+        if positions is None:
+            positions = range(self._size)
+
+        frame = self.header() + "".join(self.row(pos) for pos in positions)
+        self._changed.difference_update(positions)
+        return frame
 
+    def renderChanges(self):
+        """Returns a frame holding only the rows that changed since they were
+        last shown, or an empty string if none did."""
+        if not self._changed:
+            return ""
 
-class TileRep(object):
-    def __init__(self, name, pos, value, owner=None, isOwned=False,
-                 mortgaged=False):
-        self.name = name
-        self.pos = pos
-        self.value = value
-        self.owner = owner
-        self.isOwned = isOwned
-        self.mortgaged = mortgaged
+        return self.render(sorted(self._changed))
 
 
 class InputHandler(cmd.Cmd):
-    """Handles the game loop and user input."""
-    def __init__(self, view):
-        super().__init__()
+    """Handles the game loop and user input. Reads from the console, or from
+    the given script of commands and answers, one per line."""
+    def __init__(self, view, script=None, output=None):
+        super().__init__(stdin=script, stdout=output)
         self.prompt = "> "
         self.view = view
         self.turn = 0
+        self.use_rawinput = script is None
+
+    def readline(self, prompt="> "):
+        """Returns a line of input without its line ending. Raises EOFError
+        when the script runs out."""
+        if self.use_rawinput:
+            return input(prompt)
+
+        line = self.stdin.readline()
+        if not line:
+            raise EOFError
+
+        line = line.rstrip('\r\n')
+        self.stdout.write(prompt + line + '\n')
+        return line
 
     def preloop(self):
-        print("You are playing Monopoly!\n"
-              "Style: {}\n"
-              "Begin game?".format(self.view.style))
+        self.view.say("You are playing Monopoly!\n"
+                      "Style: {}\n"
+                      "Begin game?".format(self.view.style))
 
         if not self.confirmAction():
             raise SystemExit
 
-        print("Enter the number of players (> 1).")
+        self.view.say("Enter the number of players (> 1).")
         while True:
-            num = input(self.prompt)
+            num = self.readline()
             try:
                 num = int(num)
                 if num <= 1:
@@ -56,81 +141,75 @@ class InputHandler(cmd.Cmd):
 
                 self.view.numPlayers = num
             except ValueError:
-                print("Try again.")
+                self.view.say("Try again.")
                 continue
 
             break
 
         for i in range(self.view.numPlayers):
-            print("Player #{}".format(i + 1))
-            print("What is your name?")
-            name = input(self.prompt)
-            print("What piece will you use?")
-            piece = input(self.prompt)
-            self.view.playerAdd(PlayerRep(name, piece, 0, self.view.currency['defaultAmount']))
+            self.view.say("Player #{}".format(i + 1))
+            self.view.say("What is your name?")
+            name = self.readline()
+            while self.view.getPlayer(name):
+                self.view.say("That name is taken. Try again.")
+                name = self.readline()
+
+            self.view.say("What piece will you use?")
+            piece = self.readline()
+            self.view.playerAdd(name, piece)
 
-        print("\nIt's {}'s turn.".format(self.view.players[self.turn].name))
+        self.view.say("\nIt's {}'s turn.".format(self.view.playerAt(self.turn)['name']))
+
+    def precmd(self, line):
+        if not self.use_rawinput and line != 'EOF':
+            self.stdout.write(line + '\n')
+
+        return line
 
     def postcmd(self, stop, line):
         if line == 'quit':
-            print("Thanks for playing!")
+            self.view.announce("Thanks for playing!")
+            raise SystemExit
+        elif line == 'EOF':
+            self.view.announce("Script ended.")
             raise SystemExit
         elif self.view.numPlayers < 2:
-            print("{} is the winner! Thanks for playing!".format(self.view.players[0].name))
+            self.view.announce("{} is the winner! Thanks for playing!".format(
+                self.view.playerAt(0)['name']))
             raise SystemExit
 
-        print("\nIt's {}'s turn.".format(self.view.players[self.turn].name))
+        self.view.say("\nIt's {}'s turn.".format(self.view.playerAt(self.turn)['name']))
 
     def do_roll(self, arg):
         """Roll the dice and move your player piece."""
-        self.view.controller.playerMove(self.view.players[self.turn].name)
+        self.view.controller.playerMove(self.view.playerAt(self.turn)['name'])
 
     def do_rolld(self, arg):
         if arg:
-            self.view.controller.playerMoveDebug(self.view.players[self.turn].name, int(arg))
+            self.view.controller.playerMoveDebug(self.view.playerAt(self.turn)['name'], int(arg))
 
     def do_next(self, arg):
         """End your turn."""
         self.turn = (self.turn + 1) % self.view.numPlayers
         self.view.controller.resetCommandState()
+        self.view.flush()
+
+    def do_EOF(self, arg):
+        """Ends a scripted game when the script runs out."""
+        return True
 
     def do_players(self, arg):
         """Prints the player data for each player in the game."""
         for player in self.view.players:
-            print("{} [{}]: located at {}. Money: {}{}.".format(player.name, player.pos,
-                                                                self.view.tiles[player.pos].name,
-                                                                self.view.currency['symbol'],
-                                                                player.cash))
-            if player.properties:
-                print("Properties owned:")
-                for prop in player.properties:
-                    print(prop)
+            self.view.say("{} [{}]: located at {}. Money: {}{}.".format(
+                player['name'], player['pos'], self.view.mirror.tile(player['pos'])['name'],
+                self.view.currency['symbol'], player['cash']))
+            if player['properties']:
+                self.view.say("Properties owned:")
+                for prop in player['properties']:
+                    self.view.say(prop['name'])
             else:
-                print("No owned properties.")
-
-    def _playerOnTile(self, tiles):
-        """Takes a list of tiles. Goes through the list and prints the tile names 
-        in a column along with any players that are on those tiles."""
-        width = 0
-        for tile in tiles:
-            displayWidth = len(tile.name)
-            if displayWidth > width:
-                width = displayWidth
-
-        print("{:2} {:{}} Players\n"
-              "== {:{}} {}".format("ID", "Location", width + 1, '=' * len("Location"),
-                                   width + 1, '=' * len("Players")))
-        for tile in tiles:
-            present = []
-            for player in self.view.players:
-                if player.pos == tile.pos:
-                    present.append(player.name)
-
-            msg = "{:02} {:{}}".format(tile.pos, tile.name, width + 1)
-            if present:
-                print(msg, "{}".format(", ".join(present)), sep=" ")
-            else:
-                print(msg)
+                self.view.say("No owned properties.")
 
     def do_look(self, arg):
         """Prints tile information for <n> tiles around your player, up to a 
@@ -140,83 +219,92 @@ class InputHandler(cmd.Cmd):
 
         try:
             if not 0 <= int(arg) <= 5:
-                print("Usage: look <n>, 0 <= n <= 5")
+                self.view.say("Usage: look <n>, 0 <= n <= 5")
             else:
-                ppos = self.view.players[self.turn].pos
-                if ppos - int(arg) < 0:
-                    listTail = self.view.tiles[0:ppos + int(arg) + 1]
-                    count = int(arg) - ppos
-                    listHead = self.view.tiles[self.view.size - count:self.view.size]
-                    self._playerOnTile(listHead + listTail)
-                elif ppos + int(arg) + 1 > self.view.size:
-                    listHead = self.view.tiles[ppos - int(arg):self.view.size]
-                    count = self.view.size - ppos - 1
-                    listTail = self.view.tiles[0:int(arg) - count]
-                    self._playerOnTile(listHead + listTail)
-                else:
-                    self._playerOnTile(self.view.tiles[ppos - int(arg):ppos + int(arg) + 1])
+                ppos = self.view.playerAt(self.turn)['pos']
+                positions = [(ppos + d) % self.view.size for d in range(-int(arg), int(arg) + 1)]
+                self.stdout.write(self.view.boardMap.render(positions))
         except ValueError:
-            print("Usage: look <n>, 0 <= n <= 5")
+            self.view.say("Usage: look <n>, 0 <= n <= 5")
+
+    def do_map(self, arg):
+        """Prints the whole board with the owner of each tile and the players on
+        it. Use 'map changes' to print only the tiles that changed since they
+        were last shown."""
+        if arg == 'changes':
+            frame = self.view.boardMap.renderChanges()
+            self.stdout.write(frame if frame else "No changes.\n")
+        elif not arg:
+            self.stdout.write(self.view.boardMap.render())
+        else:
+            self.view.say("Usage: map [changes]")
 
     def do_quit(self, arg):
         """Quit the game."""
         return True
 
     def default(self, arg):
-        print("Unknown or invalid command: {}.".format(arg))
+        self.view.say("Unknown or invalid command: {}.".format(arg))
 
     def confirmAction(self, prompt="> ", invalid="Try again."):
         """Returns a yes or no answer from the user using given prompt. User
         is prompted using the given invalid argument if answer is not yes/no."""
-        action = input(prompt)
+        action = self.readline(prompt)
         while action.lower() not in ['y', 'yes', 'n', 'no']:
-            print(invalid)
-            action = input(prompt)
+            self.view.say(invalid)
+            action = self.readline(prompt)
 
         return True if action in ['y', 'yes'] else False
 
     def liquidateAssets(self, player, other, amount):
-        """Prompts player to liquidate his assets until given cash amount is
-        reached."""
-        print("{}'s Properties".format(player))
-        print('=' * (len(player) + 13))
-
-        player = self.view.getPlayer(player)
-        for tile in player.properties:
-            print(tile)
-
-        while player.cash < amount:
-            print("Amount needed: {}{}".format(self.view.currency['symbol'],
-                                               amount - player.cash))
-            if not player.properties:
-                print("Looks like you're out of properties to mortgage. Bankrupt!")
-                self.view.playerBankrupt(player.name, other)
+        """Prompts player to liquidate his assets until the debt of given cash
+        amount is paid off."""
+        self.view.say("{}'s Properties".format(player))
+        self.view.say('=' * (len(player) + 13))
+
+        for tile in self.view.getPlayer(player)['properties']:
+            self.view.say(tile['name'])
+
+        while self.view.inDebt(player):
+            self.view.say("Amount needed: {}{}".format(self.view.currency['symbol'],
+                                                       amount - self.view.getPlayer(player)['cash']))
+            if not self.view.mortgageable(player):
+                self.view.say("Looks like you're out of properties to mortgage. Bankrupt!")
+                self.view.playerBankrupt(player, other)
                 break
             else:
-                print("\nEnter the names of properties you wish to mortgage.\n"
-                      "Type DONE when you're done.")
+                self.view.say("\nEnter the names of properties you wish to mortgage.\n"
+                              "Type DONE when you're done.")
                 mortgageList = []
-                prop = input(prompt)
+                prop = self.readline()
 
                 while prop != 'DONE':
                     mortgageList.append(prop)
-                    prop = input(prompt)
+                    prop = self.readline()
 
                 for tile in mortgageList:
-                    self.view.controller.playerMortgage(player.name, tile)
+                    self.view.controller.playerMortgage(player, tile)
 
-                print("You now have {}{}.".format(self.view.currency['symbol'],
-                                                  player.cash))
+                self.view.say("You now have {}{}.".format(self.view.currency['symbol'],
+                                                          self.view.getPlayer(player)['cash']))
 
 
 class View(view.MonopolyView):
-    """Basic text view."""
-    def __init__(self):
+    """Basic text view. Given a script, reads commands and answers from it
+    instead of the console and buffers its output, writing it out once per
+    turn. In quiet mode only the result of the game is written."""
+    def __init__(self, script=None, quiet=False):
         super().__init__()
-        self._inputHandler = InputHandler(self)
-        self._players = []
+        self._buffered = script is not None or quiet
+        self._quiet = quiet
+        self._out = io.StringIO() if self._buffered else sys.stdout
+        self._inputHandler = InputHandler(self, script, self._out)
+        self.attachMirror(view.StateMirror())
+        self._order = []
         self._numPlayers = 0
- 
+        self._debts = {}
+        self._advisor = None
+
     @property
     def size(self):
         return self._size
@@ -227,16 +315,49 @@ class View(view.MonopolyView):
 
     @property
     def players(self):
-        return self._players
+        return self._mirror.players
+
+    def say(self, *args, sep=' ', end='\n'):
+        """Writes a message to the output."""
+        self._out.write(sep.join(str(arg) for arg in args) + end)
+
+    def announce(self, message):
+        """Writes a message to the output straight away, even in quiet mode."""
+        self.flush()
+        sys.stdout.write(message + '\n')
+        sys.stdout.flush()
+
+    def flush(self):
+        """Writes out buffered output. Discards it in quiet mode."""
+        if not self._buffered:
+            return
+
+        if not self._quiet:
+            sys.stdout.write(self._out.getvalue())
+            sys.stdout.flush()
+
+        self._out.seek(0)
+        self._out.truncate()
 
     def getPlayer(self, player):
-        for pl in self._players:
-            if pl.name == player:
-                return pl
+        return self._mirror.player(player)
+
+    def playerAt(self, turn):
+        """Returns the data of the player whose turn index is given."""
+        return self._mirror.player(self._order[turn])
+
+    def inDebt(self, player):
+        """Returns true if player still owes rent that could not be paid."""
+        return player in self._debts
+
+    def mortgageable(self, player):
+        """Returns the names of the properties player can still mortgage."""
+        return [tile['name'] for tile in self._mirror.owned(player) if not tile['mortgaged']]
 
-    def playerAdd(self, player):
-        self._players.append(player)
-        self._controller.playerAdd(player.name, player.piece)
+    def playerAdd(self, name, piece):
+        self._controller.playerAdd(name, piece)
+        self._order.append(name)
+        self._boardMap.place(name, 0)
 
     @property
     def numPlayers(self):
@@ -254,9 +375,23 @@ class View(view.MonopolyView):
     def currency(self):
         return self._currency
 
+    @property
+    def advisor(self):
+        return self._advisor
+
+    @advisor.setter
+    def advisor(self, advisor):
+        """Sets an object with an advise(controller, player) method, such as
+        sim.advisor.Advisor, that is consulted on every purchase."""
+        self._advisor = advisor
+
     @property
     def tiles(self):
-        return self._tiles
+        return self._mirror.tiles
+
+    @property
+    def boardMap(self):
+        return self._boardMap
 
     def registerController(self, controller):
         """Registers the controller with the view."""
@@ -264,15 +399,14 @@ class View(view.MonopolyView):
         self._size = self._controller.querySize()
         self._style = self._controller.queryStyle()
         self._currency = self._controller.queryCurrency()
-        self._tiles = [TileRep(tile['name'], tile['pos'], 
-                               tile['value'] if 'value' in tile else None,
-                               tile['owner'] if 'owner' in tile else None,
-                               tile['isOwned'] if 'isOwned' in tile else False,
-                               tile['mortgaged'] if 'mortgaged' in tile else False)
-                       for tile in self._controller.queryTiles()]
+        # names of the players still in the game, in turn order
+        self._order = [player['name'] for player in self._mirror.players]
+        self._boardMap = BoardMap(self._mirror, self._currency)
+        for player in self._mirror.players:
+            self._boardMap.place(player['name'], player['pos'])
 
     def notifyDiceRoll(self, data):
-        print("Rolled: ({}, {})".format(data['diceA'], data['diceB']))
+        self.say("Rolled: ({}, {})".format(data['diceA'], data['diceB']))
         if data['isDouble']:
             msg = "Doubles rolled! "
             if data['rollAgain']:
@@ -280,101 +414,90 @@ class View(view.MonopolyView):
             else:
                 msg += "Careful! If you roll doubles again, you'll go to jail!"
 
-            print(msg)
+            self.say(msg)
 
     def notifyOutOfMoves(self, data):
-        print("{}, you cannot roll anymore.".format(data['player']['name']))
+        self.say("{}, you cannot roll anymore.".format(data['player']['name']))
 
     def notifyBuyOpp(self, data):
-        print("\nThis property is unowned! Purchase it for {}{}?".format(self._currency['symbol'],
+        self.say("\nThis property is unowned! Purchase it for {}{}?".format(self._currency['symbol'],
                                                                        data['tile']['value']))
+        if self._advisor:
+            advice = self._advisor.advise(self._controller, data['player']['name'])
+            self.say("Advisor: {} (expected gain {}{}{:.0f} over {} rollouts).".format(
+                'buy' if advice['gain'] > 0 else 'pass', '-' if advice['gain'] < 0 else '+',
+                self._currency['symbol'], abs(advice['gain']), advice['rollouts']))
         if self._inputHandler.confirmAction():
             self._controller.playerPurchase(data['player']['name'])
         else:
-            print("Auction (unimplemented).")
+            self.say("Auction (unimplemented).")
 
     def notifyPassGo(self, data):
-        print("{} has passed GO! Collected {}200.".format(data['player']['name'],
+        self.say("{} has passed GO! Collected {}200.".format(data['player']['name'],
                                                           self._currency['symbol']))
-        for player in self._players:
-            if player.name == data['player']['name']:
-                player.cash += 200
-                break
 
     def notifyTilePurchase(self, data):
-        print("{} has purchased {}. Congratulations!".format(data['player']['name'],
+        self.say("{} has purchased {}. Congratulations!".format(data['player']['name'],
                                                              data['tile']['name']))
-        for player in self._players:
-            if player.name == data['player']['name']:
-                player.cash -= data['tile']['value']
-                player.properties.append(data['tile']['name'])
-
-                for tile in self._tiles:
-                    if tile.name == data['tile']['name']:
-                        tile.owner = player
-                        tile.isOwned = True
-                        break
-
-                break
+        self._boardMap.touch(data['tile']['pos'])
 
     def notifyInsufficientFunds(self, data):
-        print("{} has insufficient funds to do this. Short: {}{}.".format(data['player']['name'],
+        self.say("{} has insufficient funds to do this. Short: {}{}.".format(data['player']['name'],
                                                                           self._currency['symbol'],
                                                                           data['deficit']))
 
     def notifyLiquidate(self, data):
-        print("{} must sell assets until they hold {}{}.".format(data['player']['name'],
+        self.say("{} must sell assets until they hold {}{}.".format(data['player']['name'],
                                                                  self._currency['symbol'],
                                                                  data['required']))
+        self._debts[data['player']['name']] = data['required']
         self._inputHandler.liquidateAssets(data['player']['name'], data['other']['name'],
                                            data['required'])
 
     def notifyPlayerMove(self, data):
-        print("{} has moved to {}.".format(data['player']['name'], data['tile']['name']))
-        for player in self._players:
-            if player.name == data['player']['name']:
-                player.pos = data['player']['pos']
-                break
+        self.say("{} has moved to {}.".format(data['player']['name'], data['tile']['name']))
+        self._boardMap.place(data['player']['name'], data['player']['pos'])
 
     def notifyRentPaid(self, data):
-        print("{} has paid {}{} to {}.".format(data['playerRenter']['name'],
+        self.say("{} has paid {}{} to {}.".format(data['playerRenter']['name'],
                                                self._currency['symbol'], data['rent'],
                                                data['playerLandlord']['name']))
-        for player in self._players:
-            if player.name == data['playerRenter']['name']:
-                player.cash -= data['rent']
-                break
+        self._debts.pop(data['playerRenter']['name'], None)
 
     def notifyMortgage(self, data):
-        print("{} has mortgaged {} for {}{}.".format(data['player']['name'],
+        self.say("{} has mortgaged {} for {}{}.".format(data['player']['name'],
                                                      data['tile']['name'],
                                                      self._currency['symbol'],
-                                                     data['tile']['value'] / 2))
-        for player in self._players:
-            if player.name == data['player']['name']:
-                player.cash += data['tile']['value'] / 2
-                for tile in player.properties:
-                    if tile.name == data['tile']['name']:
-                        tile.mortgaged = True
-                        break
-
-                break
+                                                     data['tile']['value'] // 2))
+        self._boardMap.touch(data['tile']['pos'])
 
     def notifyNotOwned(self, data):
-        print("{}, you do not own {}.".format(data['player']['name'],
+        self.say("{}, you do not own {}.".format(data['player']['name'],
                                               data['tile']['name']))
 
     def playerBankrupt(self, player, other):
         """Takes a player out of the game. Hands over assets to other."""
+        owned = [tile['pos'] for tile in self._mirror.owned(player)]
+        index = self._order.index(player)
         self._controller.playerBankrupt(player, other)
-        self._players.remove(self.getPlayer(player))
+        self._debts.pop(player, None)
+        del self._order[index]
         self._numPlayers -= 1
+        # keep the turn index on the same player; when the player whose turn
+        # it is leaves, it moves back a seat so that 'next' goes to the player
+        # after them
+        if index <= self._inputHandler.turn and self._order:
+            self._inputHandler.turn = (self._inputHandler.turn - 1) % len(self._order)
+        self._boardMap.remove(player)
+        for pos in owned:
+            self._boardMap.touch(pos)
 
-        for tile in self._tiles:
-            if tile.owner == player:
-                tile.owner = other
-
-        print("{} has left the game.".format(player))
+        self.say("{} has left the game.".format(player))
 
     def play(self):
-        self._inputHandler.cmdloop()
+        try:
+            self._inputHandler.cmdloop()
+        except EOFError:
+            self.announce("\nScript ended.")
+        finally:
+            self.flush()
@@ -7,15 +7,213 @@
 
 import abc
 
+from engine import delta
+
+
+class DeltaDecoder(object):
+    """Rebuilds full notification data from the deltas sent by a controller in
+    delta mode. Keeps the latest known state of every player and tile."""
+    def __init__(self):
+        self._version = 0
+        self._players = {}
+        self._tiles = {}
+
+    @property
+    def version(self):
+        return self._version
+
+    def player(self, name):
+        """Returns the latest known state of the named player."""
+        return self._players.get(name)
+
+    def tile(self, name):
+        """Returns the latest known state of the named tile."""
+        return self._tiles.get(name)
+
+    def apply(self, data):
+        """Applies a delta and returns the full notification data. Raises
+        ValueError if a delta was missed."""
+        if data['version'] != self._version + 1:
+            raise ValueError("Expected delta version {}, got {}".format(self._version + 1,
+                                                                        data['version']))
+
+        self._version = data['version']
+        decoded = {}
+        for key, value in data.items():
+            if key == 'version':
+                continue
+            elif key in delta.PLAYER_KEYS and value['name'] is not None:
+                decoded[key] = self._merge(self._players, value)
+            elif key in delta.TILE_KEYS:
+                decoded[key] = self._merge(self._tiles, value)
+            else:
+                decoded[key] = value
+
+        return decoded
+
+    def _merge(self, states, changes):
+        state = dict(states.get(changes['name'], ()))
+        state.update(changes)
+        states[changes['name']] = state
+        return state
+
+
+class StateMirror(object):
+    """Latest known state of every player and tile of a game, kept in tables
+    keyed by player name and tile position. A view that creates a mirror has it
+    fed by the controller with the full data of every notification, before the
+    view receives it. Every update costs constant time per player or tile it
+    carries."""
+    def __init__(self):
+        # player packs keyed by name, in turn order
+        self._players = {}
+        # tile packs ordered by position
+        self._tiles = []
+        # tile positions keyed by name; the first tile wins when names repeat
+        self._positions = {}
+        # positions of the tiles owned by each player, in order of acquisition
+        self._owned = {}
+
+    @property
+    def players(self):
+        """Returns the player data of the players still in the game, in turn
+        order."""
+        return list(self._players.values())
+
+    @property
+    def tiles(self):
+        """Returns the tile data of every tile, ordered by position."""
+        return self._tiles
+
+    def player(self, name):
+        return self._players.get(name)
+
+    def tile(self, pos):
+        return self._tiles[pos]
+
+    def tileByName(self, name):
+        pos = self._positions.get(name)
+        return self._tiles[pos] if pos is not None else None
+
+    def owned(self, name):
+        """Returns the tile data of the tiles owned by the named player, in
+        order of acquisition."""
+        return [self._tiles[pos] for pos in self._owned.get(name, ())]
+
+    def load(self, players, tiles):
+        """Replaces the state with the given player and tile data, structured
+        according to pack()."""
+        self._players = {player['name']: player for player in players}
+        self._tiles = list(tiles)
+        self._positions = {}
+        self._owned = {name: {} for name in self._players}
+        for tile in self._tiles:
+            self._positions.setdefault(tile['name'], tile['pos'])
+            if tile.get('owner'):
+                self._owned.setdefault(tile['owner'], {})[tile['pos']] = None
+
+    def updatePlayer(self, player):
+        """Replaces the state of a player with the given full player data,
+        structured according to pack()."""
+        self._players[player['name']] = player
+
+    def mergePlayer(self, changes):
+        """Merges partial player data, such as the players of a delta, into the
+        state of the named player."""
+        self._players[changes['name']] = dict(self._players.get(changes['name'], ()), **changes)
+
+    def updateTile(self, tile):
+        """Replaces the state of a tile, keeping track of its owner."""
+        pos = tile['pos']
+        old = self._tiles[pos].get('owner')
+        new = tile.get('owner')
+        if old != new:
+            if old in self._owned:
+                self._owned[old].pop(pos, None)
+            if new:
+                self._owned.setdefault(new, {})[pos] = None
+
+        self._tiles[pos] = tile
+
+    def removePlayer(self, name):
+        """Removes a player that left the game. Their tiles keep their state
+        until they are updated."""
+        self._players.pop(name, None)
+        self._owned.pop(name, None)
+
+    def apply(self, code, data):
+        """Updates the state from the data of a notification."""
+        for key, value in data.items():
+            if key in delta.PLAYER_KEYS:
+                if value['name'] is not None:
+                    self.updatePlayer(value)
+            elif key in delta.TILE_KEYS:
+                self.updateTile(value)
+
 
 class MonopolyView(abc.ABC):
     """Abstract view class. Defines interface methods for receiving communication
     from the controller."""
+    # view method that handles each notification code
+    NOTIFY_METHODS = {
+        'OUT_OF_MOVES': 'notifyOutOfMoves',
+        'DICE_ROLL': 'notifyDiceRoll',
+        'BUY_OPP': 'notifyBuyOpp',
+        'PASS_GO': 'notifyPassGo',
+        'TILE_PURCHASE': 'notifyTilePurchase',
+        'INSUFFICIENT_FUNDS': 'notifyInsufficientFunds',
+        'LIQUIDATE': 'notifyLiquidate',
+        'PLAYER_MOVE': 'notifyPlayerMove',
+        'RENT_PAID': 'notifyRentPaid',
+        'MORTGAGE': 'notifyMortgage',
+        'NOT_OWNED': 'notifyNotOwned'
+    }
+
     def __init__(self):
         self._controller = None
+        self._decoder = None
+        self._mirror = None
+
+    @property
+    def mirror(self):
+        """Returns the StateMirror of the view, or None if it does not keep
+        one."""
+        return self._mirror
+
+    def attachMirror(self, mirror):
+        """Gives the view a StateMirror that its controller keeps up to date.
+        The mirror is loaded when the view registers with a controller, or
+        straight away if it already has."""
+        self._mirror = mirror
+        if self._controller is not None:
+            self._controller.attachMirror(mirror)
 
     def registerController(self, controller):
         self._controller = controller
+        if self._mirror is not None:
+            controller.attachMirror(self._mirror)
+
+    def notifyDelta(self, code, data):
+        """Receives a notification from a controller in delta mode. Rebuilds the
+        full data and passes it on to the matching notify method. Views that
+        forward deltas elsewhere may override this."""
+        if self._decoder is None:
+            self._decoder = DeltaDecoder()
+
+        getattr(self, self.NOTIFY_METHODS[code])(self._decoder.apply(data))
+
+    def notifyBatch(self, events):
+        """Receives the (code, data) notifications caused by one command from a
+        controller in queued mode. Passes each on to the matching notify method.
+        Views that can handle a whole batch at once may override this."""
+        for code, data in events:
+            getattr(self, self.NOTIFY_METHODS[code])(data)
+
+    def notifyDeltaBatch(self, events):
+        """Receives a batch from a controller in queued and delta mode. Passes
+        each notification on to notifyDelta."""
+        for code, data in events:
+            self.notifyDelta(code, data)
 
     @abc.abstractmethod
     def notifyOutOfMoves(self, data):